@@ -0,0 +1,256 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select
+
+from models import db, Task, TaskStats, User
+from reports import accuracy_rate, bucket_expression, bucket_key, iter_buckets, tracked_estimated_hours
+
+# pandas tarda en importarse más que toda la aplicación, así que solo se
+# carga al calcular un análisis, no al arrancar cada worker.
+
+DEFAULT_DAYS = 7
+MAX_DAYS = 366
+STATUSES = ('pending', 'in_progress', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+
+
+def parse_days(value):
+    """Días de la tendencia diaria (1..``MAX_DAYS``); lanza ``ValueError`` si no es válido"""
+    days = int(value) if value not in (None, '') else DEFAULT_DAYS
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f'days must be between 1 and {MAX_DAYS}')
+    return days
+
+
+def analytics_statements(user_id=None, days=DEFAULT_DAYS, dialect='sqlite', now=None):
+    """Sentencias del análisis: un número fijo, sea cual sea el número de usuarios
+
+    - ``counts``: conteos por usuario, estado, categoría y prioridad, de ``task_stats``
+    - ``hours``: horas estimadas y reales de las tareas completadas por
+      usuario, con las estimadas de las que tienen horas reales registradas
+      (la base de la precisión, como en ``time_tracking_statement``)
+    - ``overdue``: tareas vencidas sin completar por usuario
+    - ``daily``: tareas completadas por usuario y día en los últimos ``days`` días
+    - ``users``: nombres de usuario
+
+    Devuelve ``(inicio de la tendencia, fin, sentencias)``.
+    """
+    now = now or datetime.utcnow()
+    start = (now - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    counts = select(TaskStats.user_id, TaskStats.status, TaskStats.category, TaskStats.priority,
+                    TaskStats.task_count).filter(TaskStats.task_count > 0)
+    hours = select(
+        Task.user_id, func.count(Task.actual_hours),
+        func.coalesce(func.sum(Task.estimated_hours), 0), func.coalesce(func.sum(Task.actual_hours), 0),
+        func.coalesce(tracked_estimated_hours(), 0)
+    ).filter(Task.completed_date.isnot(None))
+    overdue = select(Task.user_id, func.count(Task.id)).filter(
+        Task.due_date < now, Task.status != 'completed'
+    )
+    day = bucket_expression(Task.completed_date, 'day', dialect)
+    daily = select(Task.user_id, day, func.count(Task.id)).filter(Task.completed_date.between(start, now))
+    users = select(User.id, User.username)
+
+    if user_id:
+        counts = counts.filter(TaskStats.user_id == user_id)
+        hours = hours.filter(Task.user_id == user_id)
+        overdue = overdue.filter(Task.user_id == user_id)
+        daily = daily.filter(Task.user_id == user_id)
+        users = users.filter(User.id == user_id)
+
+    return start, now, {
+        'counts': counts,
+        'hours': hours.group_by(Task.user_id),
+        'overdue': overdue.group_by(Task.user_id),
+        'daily': daily.group_by(Task.user_id, day),
+        'users': users
+    }
+
+
+def analytics_frames(start, end, results):
+    """Carga los resultados ``{nombre: filas}`` en DataFrames para seguir analizándolos
+
+    Devuelve un diccionario de DataFrames:
+
+    - ``users``: una fila por usuario con totales por estado, tasa de
+      completitud, vencidas, horas y precisión de la estimación
+    - ``priorities``: tareas por usuario y prioridad
+    - ``categories``: tareas totales y completadas por categoría
+    - ``daily``: tareas completadas por día (filas) y usuario (columnas),
+      con ceros en los días sin actividad
+    """
+    import pandas as pd
+
+    counts = pd.DataFrame(results['counts'], columns=['user_id', 'status', 'category', 'priority', 'tasks'])
+    users = pd.DataFrame(results['users'], columns=['user_id', 'username']).set_index('user_id')
+
+    by_status = counts.pivot_table(index='user_id', columns='status', values='tasks',
+                                   aggfunc='sum', fill_value=0)
+    by_status = by_status.reindex(index=users.index, columns=list(STATUSES), fill_value=0)
+    users = users.join(by_status)
+    users['total'] = users[list(STATUSES)].sum(axis=1)
+    users['completion_rate'] = (users['completed'] / users['total'].where(users['total'] > 0) * 100).fillna(0.0)
+
+    overdue = pd.DataFrame(results['overdue'], columns=['user_id', 'overdue']).set_index('user_id')
+    hours = pd.DataFrame(results['hours'], columns=['user_id', 'tracked', 'estimated_hours', 'actual_hours',
+                                                    'tracked_estimated'])
+    users = users.join(overdue).join(hours.set_index('user_id'))
+    users = users.fillna({'overdue': 0, 'tracked': 0, 'estimated_hours': 0.0, 'actual_hours': 0.0,
+                          'tracked_estimated': 0.0})
+    users = users.astype({'overdue': int, 'tracked': int})
+    # reports.accuracy_rate para todas las filas a la vez: solo cuentan las
+    # horas estimadas de tareas con horas reales, como en /reports/time-tracking
+    users['accuracy_rate'] = (
+        users['tracked_estimated'] / users['actual_hours'].where(users['actual_hours'] > 0) * 100
+    ).fillna(0.0)
+
+    priorities = counts.pivot_table(index='user_id', columns='priority', values='tasks',
+                                    aggfunc='sum', fill_value=0)
+    extra = [name for name in priorities.columns if name not in PRIORITIES]
+    priorities = priorities.reindex(index=users.index, columns=list(PRIORITIES) + extra, fill_value=0)
+
+    categories = counts.assign(completed=counts['tasks'].where(counts['status'] == 'completed', 0)) \
+        .groupby('category')[['tasks', 'completed']].sum()
+
+    daily = pd.DataFrame(results['daily'], columns=['user_id', 'date', 'completed'])
+    daily['date'] = daily['date'].map(bucket_key)
+    daily = daily.pivot_table(index='date', columns='user_id', values='completed', aggfunc='sum', fill_value=0)
+    daily = daily.reindex(index=list(iter_buckets(start, end, 'day')), columns=users.index, fill_value=0)
+
+    return {'users': users, 'priorities': priorities, 'categories': categories, 'daily': daily}
+
+
+def _rate(numerator, denominator):
+    return float(numerator / denominator * 100) if denominator else 0.0
+
+
+def analytics_report(frames):
+    """Resumen JSON de los DataFrames de ``analytics_frames``"""
+    users, priorities = frames['users'], frames['priorities']
+    categories, daily = frames['categories'], frames['daily']
+    total = int(users['total'].sum())
+    completed = int(users['completed'].sum())
+    estimated, actual = float(users['estimated_hours'].sum()), float(users['actual_hours'].sum())
+    tracked_estimated = float(users['tracked_estimated'].sum())
+    priority_totals = priorities.sum()
+
+    return {
+        'start': daily.index[0] if len(daily.index) else None,
+        'end': daily.index[-1] if len(daily.index) else None,
+        'totals': {
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'overdue_tasks': int(users['overdue'].sum()),
+            'completion_rate': _rate(completed, total),
+            'estimated_hours': estimated,
+            'actual_hours': actual,
+            'accuracy_rate': float(accuracy_rate(tracked_estimated, actual))
+        },
+        'users': [{
+            'user_id': int(user_id),
+            'username': row['username'],
+            'total_tasks': int(row['total']),
+            'completed_tasks': int(row['completed']),
+            'in_progress_tasks': int(row['in_progress']),
+            'pending_tasks': int(row['pending']),
+            'overdue_tasks': int(row['overdue']),
+            'completion_rate': float(row['completion_rate']),
+            'estimated_hours': float(row['estimated_hours']),
+            'actual_hours': float(row['actual_hours']),
+            'accuracy_rate': float(row['accuracy_rate']),
+            'by_priority': {name: int(count) for name, count in priorities.loc[user_id].items()},
+            'by_day': [int(count) for count in daily[user_id]]
+        } for user_id, row in users.iterrows()],
+        'priorities': [{
+            'priority': name,
+            'tasks': int(count),
+            'percentage': _rate(count, total)
+        } for name, count in priority_totals.items()],
+        'categories': [{
+            'name': name,
+            'total': int(row['tasks']),
+            'completed': int(row['completed']),
+            'completion_rate': _rate(row['completed'], row['tasks'])
+        } for name, row in categories.iterrows()],
+        'daily': [{'date': date, 'completed': int(count)} for date, count in daily.sum(axis=1).items()]
+    }
+
+
+def compute_analytics(user_id=None, days=DEFAULT_DAYS, now=None):
+    """Ejecuta las sentencias con la sesión de Flask y devuelve los DataFrames"""
+    start, end, statements = analytics_statements(user_id, days, db.engine.dialect.name, now)
+    results = {name: db.session.execute(stmt).all() for name, stmt in statements.items()}
+    return analytics_frames(start, end, results)
+
+
+def print_analytics(frames):
+    """Muestra el análisis en la consola, con el formato de ``db_tester.py``"""
+    report = analytics_report(frames)
+    totals = report['totals']
+
+    print("\nEstadísticas por Usuario:")
+    for user in report['users']:
+        print(f"\nUsuario: {user['username']}")
+        print(f"- Total de tareas: {user['total_tasks']}")
+        print(f"- Tareas completadas: {user['completed_tasks']}")
+        print(f"- Tasa de completitud: {user['completion_rate']:.1f}%")
+        print(f"- Tareas vencidas: {user['overdue_tasks']}")
+        print(f"- Precisión de estimación: {user['accuracy_rate']:.1f}%")
+
+    print("\nEstadísticas Generales:")
+    print(f"- Total de tareas: {totals['total_tasks']}")
+    print(f"- Tareas completadas: {totals['completed_tasks']}")
+    print(f"- Tasa de completitud: {totals['completion_rate']:.1f}%")
+    print(f"- Tareas vencidas: {totals['overdue_tasks']}")
+
+    print("\nDistribución por Categoría:")
+    for category in report['categories']:
+        print(f"- {category['name']}: {category['total']} tareas, {category['completed']} completadas "
+              f"({category['completion_rate']:.1f}%)")
+
+    print("\nAnálisis de Tiempo:")
+    print(f"- Horas totales estimadas: {totals['estimated_hours']:.1f}")
+    print(f"- Horas totales reales: {totals['actual_hours']:.1f}")
+    print(f"- Precisión de estimación: {totals['accuracy_rate']:.1f}%")
+
+    print("\nDistribución por Prioridad:")
+    for priority in report['priorities']:
+        print(f"- {priority['priority']}: {priority['tasks']} tareas ({priority['percentage']:.1f}%)")
+
+    print(f"\nTendencias de Completitud por Usuario ({report['start']} a {report['end']}):")
+    for user in report['users']:
+        print(f"\nUsuario: {user['username']}")
+        for day, count in zip(report['daily'], user['by_day']):
+            if count:
+                print(f"- {day['date']}: {count} tareas completadas")
+
+
+@click.command('analytics')
+@click.option('--user-id', type=int, default=None, help='Limita el análisis a un usuario')
+@click.option('--days', default=DEFAULT_DAYS, show_default=True, help='Días de la tendencia diaria')
+@click.option('--json', 'as_json', is_flag=True, help='Muestra el informe en JSON')
+@click.option('--csv-dir', type=click.Path(file_okay=False), default=None,
+              help='Guarda cada DataFrame como CSV en este directorio')
+@with_appcontext
+def analytics_command(user_id, days, as_json, csv_dir):
+    """Estadísticas por usuario, prioridad, categoría y día"""
+    try:
+        frames = compute_analytics(user_id, parse_days(days))
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    if as_json:
+        print(json.dumps(analytics_report(frames), indent=2, ensure_ascii=False))
+    else:
+        print_analytics(frames)
+
+    if csv_dir:
+        os.makedirs(csv_dir, exist_ok=True)
+        for name, frame in frames.items():
+            frame.to_csv(os.path.join(csv_dir, f'{name}.csv'))
+        print(f"\nDataFrames guardados en {csv_dir}")
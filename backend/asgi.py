@@ -0,0 +1,439 @@
+"""Punto de entrada ASGI con SQLAlchemy asíncrono (aiosqlite)
+
+Expone el mismo contrato que la aplicación Flask para ``/api/tasks``,
+``/api/auth/*``, ``/api/calendar/*``, ``/api/reports/*`` y
+``/api/export/tasks``. Usa los mismos modelos, las mismas sentencias
+(``queries.py``, ``reports.py``) y los mismos listeners de la sesión, de
+modo que ``task_stats``, las etiquetas y las versiones de datos se
+mantienen igual con cualquiera de las dos. Las
+consultas esperan a la base de datos sin bloquear el bucle de eventos y el
+hash de contraseñas se delega al pool de ``passwords.py``.
+
+Se elige al desplegar en lugar de ``wsgi:app``:
+
+    uvicorn asgi:app --workers 4
+    gunicorn --worker-class uvicorn.workers.UvicornWorker --workers 4 asgi:app
+
+El canal de eventos (``/api/stream``), la búsqueda, la sincronización
+incremental y el frontend siguen sirviéndose desde la aplicación WSGI.
+"""
+import json
+import os
+from contextlib import asynccontextmanager
+from functools import wraps
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse as BaseJSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from analytics import parse_days, analytics_statements, analytics_frames, analytics_report
+from bulk import MAX_OPERATIONS, apply_bulk
+from cache import CACHE_BACKENDS
+from config import Config, async_database_url, engine_options, register_sqlite_profile
+from etag import make_etag
+from export import EXPORT_CHUNK_SIZE, export_writer, export_headers
+from models import Task, User
+from pagination import STREAM_CHUNK_SIZE
+from passwords import PasswordHasher, PasswordPoolBusy
+from queries import (
+    task_list_statement, task_page, calendar_statement, calendar_summary_statement, calendar_summary,
+    export_statement
+)
+from reports import (
+    summary_statements, summary_report, category_statement, category_report,
+    time_tracking_statement, time_tracking_report, time_tracking_detail_statement,
+    productivity_statements, productivity_report
+)
+from serializers import row_to_dict
+from versions import version_scope, version_statement
+
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+
+
+class JSONResponse(BaseJSONResponse):
+    """JSON con el mismo formato que Flask (claves ordenadas, compacto)"""
+
+    def render(self, content):
+        return (json.dumps(content, sort_keys=True, separators=(',', ':')) + '\n').encode()
+
+
+def error(message, status=400, headers=None):
+    return JSONResponse({'error': message}, status, headers=headers)
+
+
+def with_session(handler):
+    """Abre una sesión asíncrona por petición y la pasa al handler"""
+    @wraps(handler)
+    async def wrapper(request):
+        async with request.app.state.sessions() as session:
+            return await handler(request, session)
+    return wrapper
+
+
+def _if_none_match(request):
+    tags = set()
+    for tag in request.headers.get('if-none-match', '').split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag:
+            tags.add(tag.strip('"'))
+    return tags
+
+
+def conditional(time_dependent=False):
+    """ETag, 304 y caché de respuestas, como ``etag.conditional`` y ``cache.cached``"""
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request, session):
+            scope = version_scope(request.query_params.get('user_id'))
+            version = (await session.execute(version_statement(scope))).scalar() or 0
+            etag = make_etag(request.url.path, request.query_params.multi_items(), scope, version, time_dependent)
+            headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+
+            tags = _if_none_match(request)
+            if etag in tags or '*' in tags:
+                return Response(status_code=304, headers=headers)
+
+            cache = request.app.state.cache
+            body = cache.get(etag) if cache is not None else None
+            if body is not None:
+                response = Response(body, media_type='application/json', headers={'X-Cache': 'HIT'})
+            else:
+                response = await handler(request, session)
+                if response.status_code != 200:
+                    return response
+                if cache is not None and response.media_type == 'application/json':
+                    cache.set(etag, response.body)
+                    response.headers['X-Cache'] = 'MISS'
+            response.headers.update(headers)
+            return response
+        return wrapper
+    return decorator
+
+
+# Tareas
+
+@with_session
+@conditional()
+async def get_tasks(request, session):
+    stream = request.query_params.get('format') == 'ndjson'
+    try:
+        stmt, fields, sort, limit = task_list_statement(request.query_params, stream=stream)
+    except ValueError as e:
+        return error(str(e))
+
+    # Modo streaming: el cursor del servidor necesita su propia sesión, que
+    # sigue abierta mientras se envía la respuesta
+    if stream:
+        sessions = request.app.state.sessions
+
+        async def generate():
+            async with sessions() as stream_session:
+                result = await stream_session.stream(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE))
+                async for row in result:
+                    yield json.dumps(row_to_dict(row, fields)) + '\n'
+
+        return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+    rows = (await session.execute(stmt)).all()
+    return JSONResponse(task_page(rows, fields, sort, limit))
+
+
+@with_session
+async def create_task(request, session):
+    data = await request.json()
+    user = await session.get(User, data['user_id'])
+    if user is None:
+        return error('User not found', 404)
+
+    task = Task.from_payload(data, user.id)
+    session.add(task)
+    await session.commit()
+    # to_dict carga Task.user; run_sync permite esa carga perezosa
+    return JSONResponse(await session.run_sync(lambda _: task.to_dict()))
+
+
+@with_session
+async def bulk_tasks(request, session):
+    data = await request.json() or {}
+    operations = data.get('operations')
+
+    if not isinstance(operations, list) or not operations:
+        return error('operations must be a non-empty list')
+    if len(operations) > MAX_OPERATIONS:
+        return error(f'At most {MAX_OPERATIONS} operations per batch', 413)
+    if not all(isinstance(op, dict) for op in operations):
+        return error('Each operation must be an object')
+
+    results, applied = await session.run_sync(
+        lambda sync_session: apply_bulk(operations, atomic=bool(data.get('atomic')), session=sync_session)
+    )
+    failed = sum(1 for result in results if result['status'] >= 400)
+
+    # 207 indica que parte de las operaciones falló y el resto se aplicó
+    if not applied:
+        status = 400
+    elif failed:
+        status = 207
+    else:
+        status = 200
+    return JSONResponse({'applied': applied, 'failed': failed, 'results': results}, status)
+
+
+@with_session
+async def update_task(request, session):
+    task = await session.get(Task, request.path_params['task_id'])
+    if task is None:
+        return error('Task not found', 404)
+
+    task.apply_payload(await request.json())
+    await session.commit()
+    return JSONResponse(await session.run_sync(lambda _: task.to_dict()))
+
+
+@with_session
+async def delete_task(request, session):
+    task = await session.get(Task, request.path_params['task_id'])
+    if task is None:
+        return error('Task not found', 404)
+
+    await session.delete(task)
+    await session.commit()
+    return JSONResponse({'message': 'Task deleted successfully'})
+
+
+@with_session
+@conditional()
+async def export_tasks(request, session):
+    try:
+        stmt, fields = export_statement(request.query_params)
+        writer = export_writer(request.query_params.get('format', 'csv'), fields)
+    except ValueError as e:
+        return error(str(e))
+
+    sessions = request.app.state.sessions
+
+    # Igual que el NDJSON de get_tasks, pero los bloques se convierten en un
+    # hilo: generar XLSX o Parquet bloquearía el bucle de eventos
+    async def generate():
+        async with sessions() as stream_session:
+            result = await stream_session.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+            async for rows in result.partitions():
+                data = await run_in_threadpool(writer.write, rows)
+                if data:
+                    yield data
+        for data in await run_in_threadpool(writer.finish):
+            if data:
+                yield data
+
+    return StreamingResponse(generate(), media_type=writer.content_type, headers=export_headers(writer))
+
+
+# Autenticación
+
+async def _first(session, stmt):
+    return (await session.execute(stmt)).scalars().first()
+
+
+@with_session
+async def register(request, session):
+    data = await request.json()
+    hasher = request.app.state.password_hasher
+
+    # Verificar si el usuario ya existe
+    if await _first(session, select(User).filter_by(email=data['email'])):
+        return error('Email already registered')
+    if await _first(session, select(User).filter_by(username=data['username'])):
+        return error('Username already taken')
+
+    user = User(email=data['email'], username=data['username'])
+    user.password_hash = await hasher.hash_async(data['password'])
+    session.add(user)
+    await session.commit()
+    return JSONResponse(user.to_dict(), 201)
+
+
+@with_session
+async def login(request, session):
+    data = await request.json()
+    hasher = request.app.state.password_hasher
+
+    user = await _first(session, select(User).filter_by(email=data['email']))
+    if user and await hasher.verify_async(user.password_hash, data['password']):
+        # Regenerar el hash si se cambiaron los parámetros configurados
+        if hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = await hasher.hash_async(data['password'])
+                await session.commit()
+            except PasswordPoolBusy:
+                pass
+        return JSONResponse(user.to_dict())
+
+    return error('Invalid credentials', 401)
+
+
+async def password_pool_busy(request, exc):
+    # Rechazo inmediato: el cliente reintenta en lugar de ocupar el bucle
+    return error(str(exc), 503, headers={'Retry-After': '1'})
+
+
+# Calendario y reportes
+
+@with_session
+@conditional()
+async def get_calendar_tasks(request, session):
+    try:
+        stmt, fields = calendar_statement(request.query_params)
+    except ValueError as e:
+        return error(str(e))
+
+    rows = (await session.execute(stmt)).all()
+    return JSONResponse({'tasks': [row_to_dict(row, fields) for row in rows]})
+
+
+@with_session
+@conditional()
+async def get_calendar_summary(request, session):
+    try:
+        start, end, stmt = calendar_summary_statement(request.query_params, session.bind.dialect.name)
+    except ValueError as e:
+        return error(str(e))
+
+    return JSONResponse(calendar_summary(start, end, (await session.execute(stmt)).all()))
+
+
+@with_session
+@conditional(time_dependent=True)
+async def get_summary_report(request, session):
+    by_status, overdue = summary_statements(request.query_params.get('user_id'))
+    status_rows = (await session.execute(by_status)).all()
+    overdue_tasks = (await session.execute(overdue)).scalar()
+    return JSONResponse(summary_report(status_rows, overdue_tasks))
+
+
+@with_session
+@conditional()
+async def get_category_report(request, session):
+    rows = (await session.execute(category_statement(request.query_params.get('user_id')))).all()
+    return JSONResponse(category_report(rows))
+
+
+@with_session
+@conditional()
+async def get_time_tracking_report(request, session):
+    args = request.query_params
+    groups = (await session.execute(time_tracking_statement(args.get('user_id')))).all()
+    report = time_tracking_report(groups)
+
+    # El detalle por tarea es opcional y se pagina por (completed_date, id)
+    if args.get('details', '1') in ('0', 'false'):
+        return JSONResponse(report)
+
+    try:
+        stmt, fields, limit = time_tracking_detail_statement(args)
+    except ValueError as e:
+        return error(str(e))
+
+    rows = (await session.execute(stmt)).all()
+    report.update(task_page(rows, fields, 'completed_date', limit))
+    return JSONResponse(report)
+
+
+@with_session
+@conditional(time_dependent=True)
+async def get_productivity_report(request, session):
+    try:
+        start_date, end_date, granularity, statements = productivity_statements(
+            request.query_params, session.bind.dialect.name
+        )
+    except ValueError as e:
+        return error(str(e))
+
+    rows = [(await session.execute(stmt)).all() for stmt in statements]
+    return JSONResponse(productivity_report(start_date, end_date, granularity, *rows))
+
+
+@with_session
+@conditional(time_dependent=True)
+async def get_analytics_report(request, session):
+    try:
+        days = parse_days(request.query_params.get('days'))
+    except ValueError as e:
+        return error(str(e))
+
+    start, end, statements = analytics_statements(
+        request.query_params.get('user_id'), days, session.bind.dialect.name
+    )
+    results = {name: (await session.execute(stmt)).all() for name, stmt in statements.items()}
+    return JSONResponse(analytics_report(analytics_frames(start, end, results)))
+
+
+ROUTES = [
+    Route('/api/tasks', get_tasks, methods=['GET']),
+    Route('/api/tasks', create_task, methods=['POST']),
+    Route('/api/tasks/bulk', bulk_tasks, methods=['POST']),
+    Route('/api/tasks/{task_id:int}', update_task, methods=['PUT']),
+    Route('/api/tasks/{task_id:int}', delete_task, methods=['DELETE']),
+    Route('/api/export/tasks', export_tasks, methods=['GET']),
+    Route('/api/auth/register', register, methods=['POST']),
+    Route('/api/auth/login', login, methods=['POST']),
+    Route('/api/calendar/tasks', get_calendar_tasks, methods=['GET']),
+    Route('/api/calendar/summary', get_calendar_summary, methods=['GET']),
+    Route('/api/reports/summary', get_summary_report, methods=['GET']),
+    Route('/api/reports/by-category', get_category_report, methods=['GET']),
+    Route('/api/reports/time-tracking', get_time_tracking_report, methods=['GET']),
+    Route('/api/reports/productivity', get_productivity_report, methods=['GET']),
+    Route('/api/reports/analytics', get_analytics_report, methods=['GET']),
+]
+
+
+def create_asgi_app(config=None):
+    """Crea la aplicación ASGI con la misma configuración que ``create_app``
+
+    ``config`` es un diccionario opcional que sobrescribe los valores de
+    ``Config``. El engine no abre conexiones hasta la primera petición.
+    """
+    settings = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+    settings.update(config or {})
+
+    uri = settings['SQLALCHEMY_DATABASE_URI']
+    engine = create_async_engine(
+        async_database_url(uri, INSTANCE_PATH),
+        **settings.get('SQLALCHEMY_ENGINE_OPTIONS', engine_options(uri))
+    )
+    # Los PRAGMAs se aplican sobre el engine síncrono que envuelve al asíncrono
+    register_sqlite_profile(engine.sync_engine, settings['DB_PROFILE'])
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+        app.state.password_hasher.shutdown()
+
+    app = Starlette(
+        routes=ROUTES,
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        exception_handlers={PasswordPoolBusy: password_pool_busy},
+        lifespan=lifespan
+    )
+    app.state.engine = engine
+    app.state.sessions = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.password_hasher = PasswordHasher(
+        settings['PASSWORD_HASH_METHOD'],
+        settings['PASSWORD_HASH_WORKERS'],
+        settings['PASSWORD_HASH_QUEUE']
+    )
+    backend = settings['CACHE_BACKEND']
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+    app.state.cache = CACHE_BACKENDS[backend](settings)
+    return app
+
+
+app = create_asgi_app()
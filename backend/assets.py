@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+import click
+from flask import current_app, send_file
+from flask.cli import with_appcontext
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+# Carpeta (dentro de frontend/) con los recursos generados por build-assets
+BUILD_DIR = 'dist'
+MANIFEST = 'manifest.json'
+# Recursos que se versionan con el hash de su contenido
+HASHED_ASSETS = ('app.js', 'styles.css')
+HASH_LENGTH = 10
+# Variantes precomprimidas por orden de preferencia: (Content-Encoding, sufijo)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Un año: el nombre cambia con el contenido, así que nunca hay que revalidar
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# index.html se revalida siempre (ETag/Last-Modified) para descubrir los nuevos nombres
+REVALIDATE_CACHE = 'no-cache'
+
+_HASHED_NAME = re.compile(r'\.[0-9a-f]{%d}\.[a-z]+$' % HASH_LENGTH)
+
+
+def build_dir(static_folder):
+    return os.path.join(static_folder, BUILD_DIR)
+
+
+def hashed_name(name, content):
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}'
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _write_variants(path, content, brotli):
+    """Escribe ``path`` y sus variantes .gz y .br"""
+    with open(path, 'wb') as f:
+        f.write(content)
+    # mtime=0 para que el .gz sea idéntico entre builds del mismo contenido
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(content, quality=11))
+
+
+def build_assets(static_folder):
+    """Genera ``frontend/dist`` con los recursos versionados y precomprimidos
+
+    Copia ``app.js`` y ``styles.css`` con el hash de su contenido en el
+    nombre, reescribe sus referencias en ``index.html`` y deja junto a cada
+    fichero su variante gzip y, si está instalado el paquete ``brotli``,
+    brotli. Devuelve el manifiesto ``{original: versionado}``.
+    """
+    output = build_dir(static_folder)
+    shutil.rmtree(output, ignore_errors=True)
+    os.makedirs(output)
+    brotli = _brotli()
+
+    manifest = {}
+    for name in HASHED_ASSETS:
+        with open(os.path.join(static_folder, name), 'rb') as f:
+            content = f.read()
+        manifest[name] = hashed_name(name, content)
+        _write_variants(os.path.join(output, manifest[name]), content, brotli)
+
+    with open(os.path.join(static_folder, 'index.html'), encoding='utf-8') as f:
+        html = f.read()
+    for name, hashed in manifest.items():
+        html = re.sub(r'((?:src|href)=")%s(")' % re.escape(name), r'\g<1>%s\2' % hashed, html)
+    _write_variants(os.path.join(output, 'index.html'), html.encode('utf-8'), brotli)
+
+    with open(os.path.join(output, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def negotiate_encoding(accept_encodings, available):
+    """Elige la codificación de ``available`` con mayor calidad en Accept-Encoding"""
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def send_asset(directory, path, accept_encodings):
+    """Envía un recurso generado, precomprimido si el cliente lo acepta
+
+    El fichero se entrega con ``send_file`` desde disco, de modo que el
+    servidor puede usar ``wsgi.file_wrapper`` (sendfile) sin copiarlo en
+    memoria. Los nombres con hash se sirven como inmutables.
+    """
+    filename = safe_join(directory, path)
+    if filename is None or not os.path.isfile(filename):
+        raise NotFound()
+
+    variants = {encoding: filename + suffix for encoding, suffix in ENCODINGS
+                if os.path.isfile(filename + suffix)}
+    encoding = negotiate_encoding(accept_encodings, variants)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    response = send_file(variants[encoding] if encoding else filename, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    # Las cachés intermedias deben guardar una copia por codificación
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = (
+        IMMUTABLE_CACHE if _HASHED_NAME.search(path) else REVALIDATE_CACHE
+    )
+    return response
+
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Genera los recursos del frontend versionados y precomprimidos"""
+    manifest = build_assets(current_app.static_folder)
+    for name, hashed in manifest.items():
+        print(f"{name} -> {BUILD_DIR}/{hashed}")
+    if _brotli() is None:
+        print("Paquete brotli no instalado: solo se generaron variantes gzip")
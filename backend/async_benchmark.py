@@ -0,0 +1,161 @@
+"""Compara el rendimiento con clientes concurrentes de la app WSGI y la ASGI
+
+Crea una base de datos temporal con datos de prueba, arranca cada servidor
+en un proceso propio (gunicorn o, si no está instalado, el servidor de
+Werkzeug con hilos para ``wsgi:app``; uvicorn para ``asgi:app``), ambos con
+un solo worker, y lanza clientes HTTP concurrentes con conexiones
+persistentes contra una mezcla de endpoints de lectura. La caché de
+respuestas se desactiva para medir el acceso a la base de datos.
+
+Uso:
+    python async_benchmark.py [segundos] [clientes]
+"""
+import asyncio
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from app import create_app
+from models import db, User, Task
+
+HOST = '127.0.0.1'
+PORT = 5099
+PATHS = (
+    '/api/tasks?user_id=1&limit=50',
+    '/api/tasks?sort=due_date&limit=50',
+    '/api/calendar/tasks?start=2024-01-01T00:00:00&end=2024-03-01T00:00:00&fields=id,title,due_date',
+    '/api/reports/summary?user_id=1',
+    '/api/reports/by-category',
+)
+
+
+def server_commands(port):
+    if importlib.util.find_spec('gunicorn'):
+        wsgi = [sys.executable, '-m', 'gunicorn', '--workers', '1', '--threads', '16',
+                '--bind', f'{HOST}:{port}', 'wsgi:app']
+    else:
+        wsgi = [sys.executable, '-c',
+                'from werkzeug.serving import run_simple; from app import create_app; '
+                f'run_simple("{HOST}", {port}, create_app(), threaded=True)']
+    asgi = [sys.executable, '-m', 'uvicorn', '--workers', '1', '--log-level', 'warning',
+            '--host', HOST, '--port', str(port), 'asgi:app']
+    return {'wsgi:app': wsgi, 'asgi:app': asgi}
+
+
+def seed(db_path, users=10, tasks=5000):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'SCHEMA_CHECK': 'off'})
+    with app.app_context():
+        db.create_all()
+        for i in range(users):
+            db.session.add(User(username=f'user{i}', email=f'user{i}@example.com', password_hash='-'))
+        db.session.commit()
+        statuses = ('pending', 'in_progress', 'completed')
+        db.session.add_all(Task(
+            title=f'Tarea {i}', user_id=i % users + 1, status=statuses[i % 3],
+            category=('work', 'home', 'general')[i % 3], tags='a,b' if i % 2 else None,
+            due_date=datetime(2024, i % 3 + 1, i % 28 + 1)
+        ) for i in range(tasks))
+        db.session.commit()
+
+
+async def http_request(reader, writer, path, method='GET', body=None):
+    """Envía una petición por una conexión persistente y devuelve ``(estado, keep_alive, cuerpo)``"""
+    head = f'{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n'
+    if body is not None:
+        head += f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+    writer.write(head.encode() + b'\r\n' + (body or b''))
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('closed')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'content-length' in headers:
+        content = await reader.readexactly(int(headers['content-length']))
+    else:
+        content = await reader.read()
+    keep_alive = status_line.startswith(b'HTTP/1.1') and headers.get('connection', '').lower() != 'close'
+    return int(status_line.split()[1]), keep_alive, content
+
+
+async def _client(index, deadline, latencies, errors):
+    connection = None
+    i = index
+    while time.perf_counter() < deadline:
+        path = PATHS[i % len(PATHS)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(HOST, PORT)
+            status, keep_alive, _ = await http_request(*connection, path)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            errors.append(path)
+            connection = None
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status != 200:
+            errors.append(path)
+        if not keep_alive:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def load(seconds, clients):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(_client(i, deadline, latencies, errors) for i in range(clients)))
+    return latencies, errors
+
+
+def wait_until_ready(timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('El servidor no arrancó a tiempo')
+
+
+def report(name, latencies, errors, seconds):
+    values = sorted(latencies)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    print(f"- {name}: {len(values) / seconds:.0f} peticiones/s, mediana {statistics.median(values):.1f} ms, "
+          f"p95 {p95:.1f} ms, errores {len(errors)}")
+
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        seed(db_path)
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', CACHE_BACKEND='none', SCHEMA_CHECK='off')
+
+        print(f"\n=== {clients} clientes concurrentes, {seconds:.0f} s por servidor ===")
+        for name, command in server_commands(PORT).items():
+            server = subprocess.Popen(command, cwd=backend_dir, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_ready()
+                report(name, *asyncio.run(load(seconds, clients)), seconds)
+            finally:
+                server.terminate()
+                server.wait()
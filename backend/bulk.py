@@ -0,0 +1,265 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+
+from models import db, Task, User, parse_tags
+from stats import apply_stats_deltas, stats_key
+from tags import sync_task_tags
+from versions import bump_versions, clear_tombstones, record_tombstones
+
+MAX_OPERATIONS = 1000
+OPERATIONS = ('create', 'update', 'delete')
+
+# Campos que se pueden modificar en una actualización
+UPDATABLE_FIELDS = (
+    'title', 'description', 'status', 'priority', 'due_date',
+    'estimated_hours', 'actual_hours', 'category', 'tags'
+)
+# Campos de texto que no admiten null (forman parte de la clave de task_stats)
+REQUIRED_TEXT_FIELDS = ('status', 'priority', 'category')
+# Campos de texto que admiten null
+NULLABLE_TEXT_FIELDS = ('description', 'due_date')
+HOURS_FIELDS = ('estimated_hours', 'actual_hours')
+
+
+class BulkError(Exception):
+    """Error de validación de una operación concreta del lote"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        raise BulkError(f'Invalid date: {value}')
+
+
+def _tags_value(value):
+    return ','.join(parse_tags(value)) or None
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_fields(data):
+    """Comprueba el tipo de cada campo para que un valor inválido sea un 400 de esa operación"""
+    if 'title' in data and (not isinstance(data['title'], str) or not data['title'].strip()):
+        raise BulkError('title must be a non-empty string')
+    for name in REQUIRED_TEXT_FIELDS:
+        if name in data and not isinstance(data[name], str):
+            raise BulkError(f'{name} must be a string')
+    for name in NULLABLE_TEXT_FIELDS:
+        if data.get(name) is not None and not isinstance(data[name], str):
+            raise BulkError(f'{name} must be a string or null')
+    for name in HOURS_FIELDS:
+        if data.get(name) is not None and not _is_number(data[name]):
+            raise BulkError(f'{name} must be a number or null')
+    tags = data.get('tags')
+    if tags is not None and not isinstance(tags, str) and not (
+        isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+    ):
+        raise BulkError('tags must be a string or a list of strings')
+    if 'due_date' in data:
+        _parse_date(data['due_date'])
+
+
+def _validate_operation(op):
+    """Comprueba la forma de una operación antes de tocar la base de datos"""
+    kind = op.get('op')
+    if kind not in OPERATIONS:
+        raise BulkError(f'Invalid op, expected one of: {", ".join(OPERATIONS)}')
+    if kind != 'create' and not _is_id(op.get('id')):
+        raise BulkError('id must be an integer')
+
+    data = op.get('data', {})
+    if not isinstance(data, dict):
+        raise BulkError('data must be an object')
+    if kind == 'create':
+        if not _is_id(data.get('user_id')):
+            raise BulkError('user_id must be an integer')
+        if 'title' not in data:
+            raise BulkError('Missing title')
+    _validate_fields(data)
+
+
+def _new_task_row(data, now):
+    """Fila completa para un INSERT en bloque, con los mismos valores por defecto que ``create_task``"""
+    status = data.get('status', 'pending')
+    return {
+        'title': data['title'],
+        'description': data.get('description'),
+        'status': status,
+        'priority': data.get('priority', 'medium'),
+        'due_date': _parse_date(data.get('due_date')),
+        'completed_date': Task.completed_date_for(status, None, now),
+        'estimated_hours': data.get('estimated_hours', 0),
+        'actual_hours': data.get('actual_hours', 0),
+        'category': data.get('category', 'general'),
+        'tags': _tags_value(data.get('tags')),
+        'user_id': data['user_id'],
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+def _changed_values(current, data, now):
+    """Valores a actualizar; el estado respeta la semántica de ``Task.update_status``"""
+    unknown = set(data) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise BulkError(f'Unknown fields: {", ".join(sorted(unknown))}')
+
+    values = {}
+    for name in UPDATABLE_FIELDS:
+        if name not in data:
+            continue
+        if name == 'due_date':
+            values[name] = _parse_date(data[name])
+        elif name == 'tags':
+            values[name] = _tags_value(data[name])
+        else:
+            values[name] = data[name]
+
+    if 'status' in values:
+        values['completed_date'] = Task.completed_date_for(values['status'], current['completed_date'], now)
+    values['updated_at'] = now
+    return values
+
+
+def apply_bulk(operations, atomic=False, session=None):
+    """Aplica un lote de operaciones create/update/delete en una transacción
+
+    Devuelve ``(resultados, aplicado)``. Cada operación inválida se informa
+    en su resultado sin impedir las demás, salvo con ``atomic``, donde un
+    solo error descarta el lote completo; si ninguna es válida tampoco se
+    aplica nada y ``aplicado`` es ``False``. Las escrituras se agrupan en
+    sentencias ``executemany``; ``task_stats``, ``task_tag``, las versiones y
+    los tombstones se actualizan en la misma transacción, ya que las
+    sentencias en bloque no pasan por los eventos de la sesión. ``session``
+    permite usar otra sesión síncrona en lugar de ``db.session`` (por
+    ejemplo, la de una sesión asíncrona dentro de ``run_sync``).
+    """
+    session = session or db.session
+    now = datetime.utcnow()
+    results = [None] * len(operations)
+
+    def fail(index, error):
+        results[index] = {'index': index, 'op': operations[index].get('op'), 'status': error.status,
+                          'error': str(error)}
+
+    # Las operaciones mal formadas se descartan antes de consultar nada
+    valid = []
+    for index, op in enumerate(operations):
+        try:
+            _validate_operation(op)
+            valid.append((index, op))
+        except BulkError as e:
+            fail(index, e)
+
+    # Cargar en una sola consulta las tareas y usuarios referenciados
+    task_ids = {op['id'] for _, op in valid if op['op'] in ('update', 'delete')}
+    current = {row.id: row._asdict() for row in session.execute(
+        select(Task.id, Task.user_id, Task.status, Task.category, Task.priority, Task.completed_date)
+        .where(Task.id.in_(task_ids))
+    )} if task_ids else {}
+    user_ids = {op['data']['user_id'] for _, op in valid if op['op'] == 'create'}
+    existing_users = set(session.execute(
+        select(User.id).where(User.id.in_(user_ids))
+    ).scalars()) if user_ids else set()
+
+    creates, updates, deletes = [], [], []
+    seen_ids = set()
+
+    for index, op in valid:
+        kind = op['op']
+        try:
+            if kind == 'create':
+                data = op['data']
+                if data['user_id'] not in existing_users:
+                    raise BulkError('User not found', 404)
+                creates.append((index, _new_task_row(data, now)))
+                continue
+
+            task_id = op['id']
+            if task_id not in current:
+                raise BulkError('Task not found', 404)
+            if task_id in seen_ids:
+                raise BulkError('Task appears more than once in the batch', 409)
+            seen_ids.add(task_id)
+
+            if kind == 'update':
+                updates.append((index, task_id, _changed_values(current[task_id], op.get('data', {}), now)))
+            else:
+                deletes.append((index, task_id))
+        except BulkError as e:
+            fail(index, e)
+
+    failed = sum(1 for result in results if result)
+    if atomic and failed:
+        for index, result in enumerate(results):
+            results[index] = result or {'index': index, 'op': operations[index].get('op'),
+                                        'status': 424, 'error': 'Not applied, batch is atomic'}
+        return results, False
+    # Sin operaciones válidas no se escribe nada ni se incrementan las versiones,
+    # que invalidarían los ETag y la caché de todos los usuarios
+    if not (creates or updates or deletes):
+        return results, False
+
+    deltas = Counter()
+    tags_by_task = {}
+
+    # La versión se incrementa antes de escribir para guardarla en change_seq
+    connection = session.connection()
+    change_seq = bump_versions(connection, {row['user_id'] for _, row in creates} | {
+        current[task_id]['user_id'] for _, task_id, _ in updates
+    } | {current[task_id]['user_id'] for _, task_id in deletes})
+
+    if creates:
+        rows = [dict(row, change_seq=change_seq) for _, row in creates]
+        new_ids = session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        clear_tombstones(connection, new_ids)
+        for (index, row), task_id in zip(creates, new_ids):
+            deltas[stats_key(row)] += 1
+            tags_by_task[task_id] = parse_tags(row['tags'])
+            results[index] = {'index': index, 'op': 'create', 'status': 201, 'id': task_id,
+                              'user_id': row['user_id']}
+
+    if updates:
+        session.execute(update(Task), [
+            dict(values, id=task_id, change_seq=change_seq) for _, task_id, values in updates
+        ])
+        for index, task_id, values in updates:
+            old = current[task_id]
+            deltas[stats_key(old)] -= 1
+            deltas[stats_key(dict(old, **values))] += 1
+            if 'tags' in values:
+                tags_by_task[task_id] = parse_tags(values['tags'])
+            results[index] = {'index': index, 'op': 'update', 'status': 200, 'id': task_id,
+                              'user_id': old['user_id']}
+
+    if deletes:
+        deleted_ids = [task_id for _, task_id in deletes]
+        session.execute(delete(Task).where(Task.id.in_(deleted_ids)))
+        record_tombstones(connection, [(task_id, current[task_id]['user_id']) for task_id in deleted_ids], change_seq)
+        for index, task_id in deletes:
+            deltas[stats_key(current[task_id])] -= 1
+            results[index] = {'index': index, 'op': 'delete', 'status': 200, 'id': task_id,
+                              'user_id': current[task_id]['user_id']}
+    else:
+        deleted_ids = []
+
+    apply_stats_deltas(connection, deltas)
+    sync_task_tags(connection, tags_by_task, deleted_ids)
+    session.commit()
+
+    return results, True
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response
+
+from etag import compute_etag
+
+
+class LRUCache:
+    """Caché en memoria del proceso con límite de entradas, de bytes y TTL"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+
+class RedisCache:
+    """Caché compartida entre workers y servidores; Redis aplica el TTL y la expulsión"""
+
+    name = 'redis'
+
+    def __init__(self, url, ttl=300, prefix='tasks-cache:'):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, value, ex=self.ttl)
+
+    def stats(self):
+        # Las expulsiones ocurren en el servidor (maxmemory-policy) y se
+        # consultan allí; aquí solo se cuentan los aciertos de este proceso
+        with self._lock:
+            return {'backend': self.name, 'hits': self.hits, 'misses': self.misses}
+
+
+CACHE_BACKENDS = {
+    'memory': lambda config: LRUCache(
+        config['CACHE_MAX_ENTRIES'], config['CACHE_MAX_BYTES'], config['CACHE_TTL']
+    ),
+    'redis': lambda config: RedisCache(config['CACHE_URL'], config['CACHE_TTL']),
+    'none': lambda config: None,
+}
+
+
+def init_cache(app):
+    """Crea el backend de caché indicado en ``CACHE_BACKEND``"""
+    backend = app.config['CACHE_BACKEND']
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+    app.extensions['response_cache'] = CACHE_BACKENDS[backend](app.config)
+
+
+def response_cache():
+    return current_app.extensions.get('response_cache')
+
+
+def cached(time_dependent=False):
+    """Caché de lectura de las respuestas JSON de un endpoint
+
+    La clave es el ETag de la petición, que ya combina la ruta, los
+    parámetros y la versión de datos del usuario: cualquier escritura
+    incrementa la versión y las entradas anteriores dejan de usarse sin
+    invalidarlas explícitamente; las abandona el LRU o el TTL. Por eso el
+    backend en memoria es correcto también con varios workers. Solo se
+    guardan las respuestas 200 en JSON, ya serializadas.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = response_cache()
+            if cache is None:
+                return view(*args, **kwargs)
+
+            key = compute_etag(time_dependent)
+            body = cache.get(key)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.mimetype == 'application/json':
+                cache.set(key, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
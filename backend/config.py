@@ -0,0 +1,137 @@
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Perfiles de almacenamiento para SQLite. Cada PRAGMA se puede sobrescribir con
+# una variable de entorno SQLITE_<NOMBRE>, por ejemplo SQLITE_CACHE_SIZE=-128000.
+SQLITE_PROFILES = {
+    # WAL permite lectores concurrentes con un escritor; synchronous=NORMAL es
+    # seguro en WAL y evita un fsync por transacción.
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,        # 64 MB (valor negativo = KiB)
+        'mmap_size': 268435456,      # 256 MB
+        'busy_timeout': 5000,        # ms esperando un bloqueo antes de fallar
+        'temp_store': 'MEMORY',
+    },
+    # Configuración por defecto de SQLite, útil para depurar
+    'default': {},
+}
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def sqlite_pragmas(profile):
+    """PRAGMAs del perfil indicado con las sobrescrituras del entorno aplicadas"""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f'Unknown database profile: {profile}')
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in pragmas:
+        override = os.environ.get(f'SQLITE_{name.upper()}')
+        if override:
+            pragmas[name] = override
+    return pragmas
+
+
+def engine_options(uri):
+    """Opciones de ``create_engine`` adecuadas para la URI de la base de datos"""
+    url = make_url(uri)
+
+    if url.get_backend_name() == 'sqlite':
+        if not url.database or url.database == ':memory:':
+            # Las bases de datos en memoria usan un pool propio de SQLAlchemy
+            return {}
+        return {
+            'pool_size': _env_int('DB_POOL_SIZE', 10),
+            'max_overflow': _env_int('DB_MAX_OVERFLOW', 20),
+            'pool_timeout': _env_int('DB_POOL_TIMEOUT', 10),
+        }
+
+    # Servidores de base de datos (PostgreSQL, MySQL...) con varios workers
+    return {
+        'pool_size': _env_int('DB_POOL_SIZE', 10),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+    }
+
+
+# Driver asíncrono equivalente para el engine de asgi.py
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def async_database_url(uri, instance_path):
+    """Convierte la URI de la aplicación Flask a su driver asíncrono
+
+    Las rutas relativas de SQLite se resuelven, igual que en Flask-SQLAlchemy,
+    respecto a la carpeta ``instance`` para que ambas apps usen el mismo fichero.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver for database backend: {backend}')
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == 'sqlite' and url.database and url.database != ':memory:' \
+            and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(instance_path, url.database))
+    return url
+
+
+def register_sqlite_profile(engine, profile):
+    """Aplica los PRAGMAs del perfil a cada conexión nueva del engine"""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(profile)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///tasks.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')  # Cambiar en producción
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'production')
+    # Comprobación de la revisión de migraciones: warn, error u off
+    SCHEMA_CHECK = os.environ.get('SCHEMA_CHECK', 'warn')
+    # Hash de contraseñas: al cambiar el método, los hashes antiguos se
+    # regeneran en el siguiente login correcto
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:260000')
+    # Hilos que calculan hashes y operaciones que pueden esperar turno (0 = en línea)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 16))
+    # Caché de respuestas de lectura: memory (por proceso), redis (compartida) o none
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_URL = os.environ.get('CACHE_URL', 'redis://localhost:6379/0')
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Métricas por endpoint en /metrics, consultas lentas y cabecera X-Query-Count
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+    METRICS_SLOW_QUERY_MS = int(os.environ.get('METRICS_SLOW_QUERY_MS', 200))
+    METRICS_SLOW_QUERY_LOG_SIZE = int(os.environ.get('METRICS_SLOW_QUERY_LOG_SIZE', 100))
+    # Valores de los parámetros en el registro de consultas lentas (pueden
+    # incluir emails y hashes): solo para depurar
+    METRICS_SLOW_QUERY_PARAMS = os.environ.get('METRICS_SLOW_QUERY_PARAMS', '0') == '1'
+    METRICS_QUERY_HEADER = os.environ.get('METRICS_QUERY_HEADER', '0') == '1'
+
+
+class TestConfig(Config):
+    """Base de datos en memoria, sin comprobación de esquema"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SCHEMA_CHECK = 'off'
@@ -1,29 +1,285 @@
+"""Visor de solo lectura de la base de datos SQLite
+
+Abre la base de datos con ``mode=ro``, así que se puede usar sobre la base
+de datos en producción (WAL) mientras la aplicación escribe: no bloquea a
+los escritores y cualquier intento de modificación falla. Las filas se leen
+con ``fetchmany`` por páginas y se muestran a medida que llegan, de modo que
+la memoria no depende del tamaño de la tabla. En una terminal se pide
+confirmación antes de cada página.
+
+Con ``--immutable`` SQLite no usa bloqueos ni lee el WAL: solo es seguro
+sobre una copia o una base de datos que nadie está modificando, pero
+funciona aunque no se pueda escribir en el directorio (ficheros -shm).
+
+Uso:
+    python db_viewer.py [--db instance/tasks.db] [--table task] [--columns id,title,status]
+                        [--status pending] [--user 1|user1] [--since 2024-01-01]
+                        [--until 2024-02-01] [--date-column due_date] [--after-id 1000]
+                        [--limit 100] [--page-size 50] [--format table|ndjson]
+                        [--max-width 40] [--no-pager] [--immutable]
+    python db_viewer.py --stats
+"""
+import argparse
+import json
+import os
 import sqlite3
+import sys
 from datetime import datetime
+from urllib.parse import quote
+
+from sqlalchemy.engine import make_url
+
+DEFAULT_PAGE_SIZE = 50
+# Ancho máximo de una columna en el formato tabla; el resto se recorta con "…"
+DEFAULT_MAX_WIDTH = 40
+
+
+def default_database_path():
+    """Fichero de ``DATABASE_URL`` resuelto, como en Flask-SQLAlchemy, respecto a ``instance``"""
+    url = make_url(os.environ.get('DATABASE_URL', 'sqlite:///tasks.db'))
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        raise SystemExit('DATABASE_URL no apunta a un fichero SQLite; indica --db')
+    if os.path.isabs(url.database):
+        return url.database
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', url.database)
+
+
+def connect_readonly(path, immutable=False):
+    """Conexión de solo lectura (``mode=ro`` y ``query_only``)"""
+    if not os.path.exists(path):
+        raise SystemExit(f'No existe la base de datos: {path}')
+    uri = f'file:{quote(os.path.abspath(path))}?mode=ro'
+    if immutable:
+        uri += '&immutable=1'
+    connection = sqlite3.connect(uri, uri=True)
+    connection.execute('PRAGMA query_only=ON')
+    return connection
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_columns(connection, table):
+    """Columnas de ``table``; termina con un error si la tabla no existe"""
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        raise SystemExit(f'No existe la tabla: {table}')
+    return [row[1] for row in connection.execute(f'PRAGMA table_info({_quote(table)})')]
+
+
+def _parse_date(value):
+    # SQLAlchemy guarda las fechas de SQLite como texto 'YYYY-MM-DD HH:MM:SS.ffffff',
+    # que se ordena igual que la fecha
+    try:
+        return str(datetime.fromisoformat(value))
+    except ValueError:
+        raise SystemExit(f'Fecha no válida: {value}')
+
+
+def build_query(connection, args):
+    """Devuelve ``(sql, parámetros, columnas)`` a partir de las opciones"""
+    available = table_columns(connection, args.table)
+
+    def require(column, option):
+        if column not in available:
+            raise SystemExit(f'La tabla {args.table} no tiene la columna {column} ({option})')
+        return _quote(column)
+
+    columns = [name.strip() for name in args.columns.split(',') if name.strip()] if args.columns else available
+    for name in columns:
+        require(name, '--columns')
+
+    where, params = [], []
+    if args.status:
+        where.append(f"{require('status', '--status')} IN ({', '.join('?' * len(args.status))})")
+        params.extend(args.status)
+    if args.user:
+        column = require('user_id', '--user')
+        if args.user.isdigit():
+            where.append(f'{column} = ?')
+        else:
+            where.append(f'{column} = (SELECT id FROM "user" WHERE username = ?)')
+        params.append(args.user)
+    if args.since or args.until:
+        column = require(args.date_column, '--date-column')
+        if args.since:
+            where.append(f'{column} >= ?')
+            params.append(_parse_date(args.since))
+        if args.until:
+            where.append(f'{column} < ?')
+            params.append(_parse_date(args.until))
+
+    # Orden por clave primaria: --after-id continúa sin OFFSET
+    order = 'id' if 'id' in available else 'rowid'
+    if args.after_id is not None:
+        where.append(f'{_quote(order)} > ?')
+        params.append(args.after_id)
+
+    sql = f'SELECT {", ".join(_quote(name) for name in columns)} FROM {_quote(args.table)}'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += f' ORDER BY {_quote(order)}'
+    if args.limit is not None:
+        sql += ' LIMIT ?'
+        params.append(args.limit)
+    return sql, params, columns
+
+
+def iter_pages(cursor, page_size):
+    while True:
+        rows = cursor.fetchmany(page_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _cell(value, max_width):
+    text = '' if value is None else str(value).replace('\n', ' ')
+    return text if len(text) <= max_width else text[:max_width - 1] + '…'
+
+
+def format_table(columns, rows, max_width=DEFAULT_MAX_WIDTH):
+    """Líneas de una página en columnas alineadas (anchos calculados por página)"""
+    cells = [[_cell(value, max_width) for value in row] for row in rows]
+    widths = [max([len(name)] + [len(row[i]) for row in cells]) for i, name in enumerate(columns)]
+    lines = [' | '.join(name.ljust(width) for name, width in zip(columns, widths)).rstrip(),
+             '-+-'.join('-' * width for width in widths)]
+    lines.extend(' | '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in cells)
+    return lines
+
+
+def view_rows(connection, args, out=sys.stdout):
+    sql, params, columns = build_query(connection, args)
+    cursor = connection.execute(sql, params)
+    interactive = args.format == 'table' and not args.no_pager and out.isatty() and sys.stdin.isatty()
+
+    shown = 0
+    for rows in iter_pages(cursor, args.page_size):
+        if args.format == 'ndjson':
+            for row in rows:
+                out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n')
+        else:
+            print('\n'.join(format_table(columns, rows, args.max_width)), file=out)
+        shown += len(rows)
+        if interactive and len(rows) == args.page_size:
+            if input(f'-- {shown} filas; Enter para seguir, q para salir -- ').strip().lower() == 'q':
+                break
+            print(file=out)
+    cursor.close()
+
+    if args.format == 'table':
+        print(f'\n{shown} filas', file=out)
+
+
+def _size(num_bytes):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f'{num_bytes:.0f} {unit}' if unit == 'B' else f'{num_bytes:.1f} {unit}'
+        num_bytes /= 1024
+
+
+def _object_pages(connection):
+    """``{objeto: (páginas, bytes)}`` de la tabla virtual ``dbstat``, si SQLite la incluye"""
+    try:
+        rows = connection.execute('SELECT name, count(*), sum(pgsize) FROM dbstat GROUP BY name').fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {name: (pages, size) for name, pages, size in rows}
+
+
+def print_stats(connection, path, out=sys.stdout):
+    """Tamaño del fichero, páginas, filas y tamaño por tabla e índices con sus estadísticas"""
+    pragma = {name: connection.execute(f'PRAGMA {name}').fetchone()[0]
+              for name in ('page_size', 'page_count', 'freelist_count', 'journal_mode')}
+    wal = path + '-wal'
+
+    print(f'\n=== {path} ===', file=out)
+    print(f'- SQLite {sqlite3.sqlite_version}, journal_mode={pragma["journal_mode"]}', file=out)
+    print(f'- Fichero: {_size(os.path.getsize(path))}'
+          + (f' (+ WAL {_size(os.path.getsize(wal))})' if os.path.exists(wal) else ''), file=out)
+    print(f'- Páginas: {pragma["page_count"]} de {pragma["page_size"]} B, '
+          f'{pragma["freelist_count"]} libres', file=out)
+
+    pages = _object_pages(connection)
+    objects = connection.execute(
+        "SELECT type, name, tbl_name, sql FROM sqlite_master "
+        "WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_stat%' ORDER BY tbl_name, type DESC, name"
+    ).fetchall()
+
+    def usage(name):
+        if pages is None or name not in pages:
+            return '-', '-'
+        return str(pages[name][0]), _size(pages[name][1])
+
+    print('\nTablas:', file=out)
+    rows = [(name, str(connection.execute(f'SELECT count(*) FROM {_quote(name)}').fetchone()[0]), *usage(name))
+            for kind, name, _, sql in objects if kind == 'table' and not (sql or '').startswith('CREATE VIRTUAL')]
+    print('\n'.join(format_table(('tabla', 'filas', 'páginas', 'tamaño'), rows)), file=out)
+
+    # SQLite no lleva contadores de uso de índices: se muestra su tamaño y la
+    # selectividad que calcula ANALYZE (filas de la tabla y filas por clave)
+    try:
+        stat1 = {index: stat for _, index, stat in connection.execute('SELECT tbl, idx, stat FROM sqlite_stat1')}
+    except sqlite3.OperationalError:
+        stat1 = {}
+    print('\nÍndices:', file=out)
+    rows = []
+    for kind, name, table, _ in objects:
+        if kind != 'index':
+            continue
+        columns = ', '.join(row[2] or '<expr>' for row in connection.execute(f'PRAGMA index_info({_quote(name)})'))
+        rows.append((name, table, columns, *usage(name), stat1.get(name, '-')))
+    print('\n'.join(format_table(('índice', 'tabla', 'columnas', 'páginas', 'tamaño', 'sqlite_stat1'), rows)),
+          file=out)
+    if not stat1:
+        print('\nSin estadísticas de ANALYZE: el planificador no conoce la selectividad de los índices', file=out)
+    if pages is None:
+        print('\nEsta versión de SQLite no incluye dbstat: no se muestran páginas por tabla', file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Visor de solo lectura de la base de datos')
+    parser.add_argument('--db', help='fichero SQLite (por defecto el de DATABASE_URL)')
+    parser.add_argument('--immutable', action='store_true',
+                        help='sin bloqueos ni WAL; solo para copias o bases de datos sin escrituras')
+    parser.add_argument('--stats', action='store_true', help='tamaños de tablas e índices y páginas')
+    parser.add_argument('--table', default='task')
+    parser.add_argument('--columns', help='columnas separadas por comas')
+    parser.add_argument('--status', action='append', help='filtra por estado; se puede repetir')
+    parser.add_argument('--user', help='id o nombre del usuario')
+    parser.add_argument('--since', help='fecha ISO mínima (incluida) de --date-column')
+    parser.add_argument('--until', help='fecha ISO máxima (excluida) de --date-column')
+    parser.add_argument('--date-column', default='created_at')
+    parser.add_argument('--after-id', type=int, help='empieza después de este id')
+    parser.add_argument('--limit', type=int, help='número máximo de filas')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='filas por fetchmany')
+    parser.add_argument('--format', choices=('table', 'ndjson'), default='table')
+    parser.add_argument('--max-width', type=int, default=DEFAULT_MAX_WIDTH, help='ancho máximo de columna')
+    parser.add_argument('--no-pager', action='store_true', help='no pide confirmación entre páginas')
+    args = parser.parse_args(argv)
+    if args.page_size < 1 or args.max_width < 2:
+        parser.error('--page-size debe ser positivo y --max-width al menos 2')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = args.db or default_database_path()
+    connection = connect_readonly(path, args.immutable)
+    try:
+        if args.stats:
+            print_stats(connection, path)
+        else:
+            view_rows(connection, args)
+    except BrokenPipeError:
+        # Salida cortada por "| head" o similar
+        sys.stderr.close()
+    finally:
+        connection.close()
 
-def view_tasks():
-    conn = sqlite3.connect('instance/tasks.db')
-    cursor = conn.cursor()
-    
-    # Obtener todas las tareas
-    cursor.execute('SELECT * FROM task')
-    tasks = cursor.fetchall()
-    
-    # Obtener nombres de columnas
-    cursor.execute('PRAGMA table_info(task)')
-    columns = [col[1] for col in cursor.fetchall()]
-    
-    print("\n=== Contenido de la base de datos ===")
-    print(f"\nColumnas: {', '.join(columns)}")
-    print("\nTareas:")
-    
-    for task in tasks:
-        print("\n---")
-        for i, value in enumerate(task):
-            if value is not None:
-                print(f"{columns[i]}: {value}")
-    
-    conn.close()
 
 if __name__ == '__main__':
-    view_tasks() 
\ No newline at end of file
+    main()
@@ -0,0 +1,55 @@
+import hashlib
+import time
+from functools import wraps
+
+from flask import g, make_response, request
+
+from versions import current_version
+
+# Los endpoints que dependen de la hora actual (tareas vencidas, ventanas
+# relativas a "ahora") cambian su ETag como mucho cada TIME_BUCKET segundos
+TIME_BUCKET = 60
+
+
+def compute_etag(time_dependent=False):
+    """ETag de la petición actual a partir de la versión de datos del usuario
+
+    No depende del cuerpo de la respuesta: combina la ruta, los parámetros
+    y la versión, así que se calcula con una sola consulta por clave primaria.
+    Se memoriza en ``g`` para que la caché de respuestas reutilice el valor.
+    """
+    etags = g.setdefault('_etags', {})
+    if time_dependent not in etags:
+        scope, version = current_version(request.args.get('user_id'))
+        etags[time_dependent] = make_etag(
+            request.path, request.args.items(multi=True), scope, version, time_dependent
+        )
+    return etags[time_dependent]
+
+
+def make_etag(path, args, scope, version, time_dependent=False):
+    """ETag a partir de la ruta, los pares (parámetro, valor) y la versión"""
+    parts = [path, sorted(args), scope, version]
+    if time_dependent:
+        parts.append(int(time.time() // TIME_BUCKET))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def conditional(time_dependent=False):
+    """Añade ETag fuerte y responde 304 si coincide con ``If-None-Match``"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(time_dependent)
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # El navegador puede guardar la respuesta pero debe revalidarla
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+# Eventos recientes que se conservan para reanudar con Last-Event-ID
+BUFFER_SIZE = 1000
+# Eventos pendientes por cliente; si un cliente lento lo llena se le
+# desconecta en lugar de acumular memoria o bloquear a quien publica
+QUEUE_SIZE = 256
+HEARTBEAT_SECONDS = 15
+# Milisegundos que espera el navegador antes de reconectar
+RETRY_MS = 3000
+
+
+class Subscription:
+    """Cola acotada de un cliente conectado, filtrada por usuario"""
+
+    def __init__(self, user_id=None):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def accepts(self, user_id):
+        return self.user_id is None or self.user_id == user_id
+
+
+class EventHub:
+    """Publicación/suscripción en memoria del proceso
+
+    Cada evento se serializa una sola vez y se reparte a las colas de los
+    suscriptores. Los ids son ``<época>-<secuencia>``: la época cambia en
+    cada arranque del proceso, así que un Last-Event-ID de otro proceso o
+    demasiado antiguo para el buffer se detecta y el cliente debe resincronizar.
+    """
+
+    def __init__(self, buffer_size=BUFFER_SIZE):
+        self.epoch = os.urandom(4).hex()
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = set()
+
+    def publish(self, event, task_id, user_id, data):
+        """Emite un evento ``created``/``updated``/``deleted`` de una tarea"""
+        payload = json.dumps({'type': event, 'id': task_id, 'user_id': user_id, 'task': data})
+        with self._lock:
+            self._seq += 1
+            message = (self._seq, user_id, format_event(f'{self.epoch}-{self._seq}', event, payload))
+            self._buffer.append(message)
+            for subscription in self._subscribers:
+                if subscription.overflowed or not subscription.accepts(user_id):
+                    continue
+                try:
+                    subscription.queue.put_nowait(message[2])
+                except queue.Full:
+                    subscription.overflowed = True
+
+    def subscribe(self, user_id=None, last_event_id=None):
+        """Registra un suscriptor y devuelve ``(suscripción, pendientes)``
+
+        ``pendientes`` son los eventos del buffer posteriores a
+        ``last_event_id``, o ``None`` si no se pueden recuperar y el cliente
+        tiene que resincronizar. El registro y la lectura del buffer ocurren
+        bajo el mismo bloqueo para no perder ni duplicar eventos.
+        """
+        subscription = Subscription(user_id)
+        with self._lock:
+            missed = [] if last_event_id is None else self._replay(last_event_id, subscription)
+            self._subscribers.add(subscription)
+        return subscription, missed
+
+    def resync_event(self):
+        """Evento ``resync`` con el id actual, para reanudar desde aquí tras recargar"""
+        with self._lock:
+            return format_event(f'{self.epoch}-{self._seq}', 'resync', '{}')
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _replay(self, last_event_id, subscription):
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return [text for event_seq, user_id, text in self._buffer
+                if event_seq > seq and subscription.accepts(user_id)]
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+def format_event(event_id, event, data):
+    """Mensaje en el formato de text/event-stream"""
+    return f'id: {event_id}\nevent: {event}\ndata: {data}\n\n'
+
+
+def stream_events(hub, user_id=None, last_event_id=None, heartbeat=HEARTBEAT_SECONDS):
+    """Generador del cuerpo de la respuesta SSE de un suscriptor
+
+    Envía los eventos perdidos desde ``last_event_id`` y después espera en
+    la cola del cliente, mandando un comentario de heartbeat si no hay
+    eventos; así también se detectan las conexiones cerradas. Si no se pudo
+    reanudar se envía ``resync`` para que el cliente recargue los datos. Si
+    el cliente se queda atrás (cola llena) recibe ``resync`` y se cierra la
+    conexión: el navegador vuelve a conectarse y reanuda desde ese evento.
+    """
+    # La suscripción se crea al empezar a enviar: un generador que nunca
+    # llega a iterarse no ejecutaría el finally y la dejaría registrada
+    subscription, missed = hub.subscribe(user_id, last_event_id)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        if missed is None:
+            yield hub.resync_event()
+        else:
+            yield from missed
+
+        while True:
+            try:
+                yield subscription.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+            if subscription.overflowed:
+                yield hub.resync_event()
+                return
+    finally:
+        hub.unsubscribe(subscription)
+
+hub = EventHub()
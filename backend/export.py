@@ -0,0 +1,179 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+
+from serializers import TASK_FIELDS
+
+# Filas por bloque leído del cursor del servidor; en Parquet, filas por row group
+EXPORT_CHUNK_SIZE = 10000
+# Filas por hoja de Excel, incluida la cabecera; al llenarse se abre otra hoja
+XLSX_MAX_ROWS = 1048576
+# Tamaño de los trozos en que se envía el fichero XLSX ya generado
+FILE_BLOCK_SIZE = 64 * 1024
+
+# Los exportadores reciben las filas por bloques (``write``) y devuelven los
+# bytes que ya se pueden enviar, así que sirven igual para un generador WSGI
+# que para uno asíncrono. ``finish`` devuelve un iterable con el resto.
+
+
+class CsvExport:
+    """CSV con cabecera; cada bloque de filas se envía en cuanto se escribe"""
+
+    extension = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._header = True
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self._header:
+            writer.writerow(self.fields)
+            self._header = False
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+    def finish(self):
+        return [self.write([])] if self._header else []
+
+
+class XlsxExport:
+    """Libro de Excel con el modo de solo escritura de openpyxl
+
+    Las filas se escriben a un fichero temporal a medida que llegan, sin
+    mantener las celdas en memoria. El formato ZIP necesita el libro completo,
+    así que el fichero se envía al terminar.
+    """
+
+    extension = 'xlsx'
+    content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, fields):
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        self.fields = fields
+        self._illegal = ILLEGAL_CHARACTERS_RE
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+
+    def _new_sheet(self):
+        count = len(self._workbook.worksheets)
+        self._sheet = self._workbook.create_sheet('tasks' if not count else f'tasks-{count + 1}')
+        self._sheet.append(self.fields)
+        self._sheet_rows = 1
+
+    def _cell(self, value):
+        # Los caracteres de control no están permitidos en el XML de la hoja
+        return self._illegal.sub('', value) if isinstance(value, str) else value
+
+    def write(self, rows):
+        for row in rows:
+            if self._sheet is None or self._sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append([self._cell(value) for value in row])
+            self._sheet_rows += 1
+        return b''
+
+    def finish(self):
+        if self._sheet is None:
+            self._new_sheet()
+        output = tempfile.TemporaryFile()
+        self._workbook.save(output)
+        output.seek(0)
+        return _read_blocks(output)
+
+
+def _read_blocks(output):
+    with output:
+        while True:
+            block = output.read(FILE_BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+
+
+class _ChunkSink(io.RawIOBase):
+    """Fichero de solo escritura que acumula los bytes hasta que se recogen con ``drain``"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetExport:
+    """Parquet con un row group por bloque, que se envía en cuanto se escribe"""
+
+    extension = 'parquet'
+    content_type = 'application/vnd.apache.parquet'
+
+    def __init__(self, fields):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        types = {int: pa.int64(), float: pa.float64(), str: pa.string(), datetime: pa.timestamp('us')}
+        self._pa = pa
+        self.fields = fields
+        self._schema = pa.schema([(name, types[TASK_FIELDS[name].type.python_type]) for name in fields])
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+    def write(self, rows):
+        if rows:
+            columns = list(zip(*rows))
+            self._writer.write_table(self._pa.Table.from_arrays(
+                [self._pa.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+                schema=self._schema
+            ))
+        return self._sink.drain()
+
+    def finish(self):
+        self._writer.close()
+        return [self._sink.drain()]
+
+
+EXPORT_FORMATS = {export.extension: export for export in (CsvExport, XlsxExport, ParquetExport)}
+
+
+def export_writer(name, fields):
+    """Exportador del formato ``name``; lanza ``ValueError`` si no existe"""
+    if name not in EXPORT_FORMATS:
+        raise ValueError(f'Invalid format, expected one of: {", ".join(EXPORT_FORMATS)}')
+    return EXPORT_FORMATS[name](fields)
+
+
+def export_headers(writer):
+    return {'Content-Disposition': f'attachment; filename="tasks.{writer.extension}"'}
+
+
+def export_chunks(writer, partitions):
+    """Bytes de la exportación a partir de los bloques de filas de ``partitions``"""
+    for rows in partitions:
+        data = writer.write(rows)
+        if data:
+            yield data
+    for data in writer.finish():
+        if data:
+            yield data
@@ -0,0 +1,300 @@
+"""Prueba de carga HTTP de extremo a extremo con líneas base de latencia
+
+Crea una base de datos temporal del tamaño indicado, arranca la aplicación
+en un proceso propio (``wsgi:app`` o ``asgi:app``, como en
+``async_benchmark.py``) y lanza clientes concurrentes con conexiones
+persistentes. Cada cliente es un usuario que elige en cada paso una
+operación de ``OPERATIONS`` según su peso: login, listado, alta,
+modificación, calendario y reportes. Todo es determinista a partir de
+``--seed`` y no necesita red.
+
+Al terminar muestra por operación el número de peticiones, el throughput,
+los percentiles p50/p95/p99 y los errores. Con ``--save`` guarda el
+resultado como línea base en JSON y con ``--baseline`` lo compara con una
+anterior: sale con código 1 si alguna operación empeora más de
+``--threshold``.
+
+Uso:
+    python load_test.py [--users 20] [--tasks 200] [--clients 50] [--seconds 30]
+                        [--server wsgi|asgi] [--save base.json]
+                        [--baseline base.json] [--threshold 0.25]
+
+Las variables de entorno de ``Config`` (``CACHE_BACKEND``,
+``PASSWORD_HASH_WORKERS``...) se pasan al servidor.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import create_app
+from async_benchmark import HOST, PORT, http_request, server_commands, wait_until_ready
+from models import db, Task
+from seeding import PRIORITIES, SEED_PASSWORD, seed_database
+
+STATUSES = ('pending', 'in_progress', 'completed')
+# Fecha de referencia de los datos sembrados
+SEED_REFERENCE = datetime(2025, 1, 1)
+# Diferencia mínima en ms para considerar una regresión de latencia; por
+# debajo el ruido de la medición domina
+MIN_DELTA_MS = 1.0
+# Aumento máximo tolerado de la tasa de errores (en tanto por uno)
+MAX_ERROR_RATE_DELTA = 0.01
+
+
+def seed(db_path, users, tasks_per_user, seed_value):
+    """Siembra ``users * tasks_per_user`` tareas con ``seeding.seed_database``, como ``flask seed``
+
+    Las fechas se generan respecto a ``SEED_REFERENCE`` para que el mismo
+    ``--seed`` produzca los mismos datos y caigan en los meses de 2024 que
+    consulta el calendario. Devuelve ``{user_id: [ids de sus tareas]}``:
+    el generador reparte las tareas al azar entre los usuarios.
+    """
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'SCHEMA_CHECK': 'off'})
+    with app.app_context():
+        seed_database(seed_value, users, users * tasks_per_user, reference=SEED_REFERENCE)
+        task_ids = {user_id: [] for user_id in range(1, users + 1)}
+        for task_id, user_id in db.session.execute(select(Task.id, Task.user_id).order_by(Task.id)):
+            task_ids[user_id].append(task_id)
+    return task_ids
+
+
+class VirtualUser:
+    """Estado de un cliente: su usuario, su generador aleatorio y sus tareas"""
+
+    def __init__(self, index, users, task_ids, seed_value):
+        self.user_id = index % users + 1
+        self.task_ids = task_ids.get(self.user_id, [])
+        self.rng = random.Random(seed_value * 100003 + index)
+        self.created = []
+
+    def task_id(self):
+        if self.created and (self.rng.random() < 0.5 or not self.task_ids):
+            return self.rng.choice(self.created)
+        # Un usuario sin tareas sembradas ni creadas modifica una inexistente (404)
+        return self.rng.choice(self.task_ids) if self.task_ids else 0
+
+    def month(self):
+        month = self.rng.randint(1, 12)
+        end = '2025-01-01' if month == 12 else f'2024-{month + 1:02d}-01'
+        return f'start=2024-{month:02d}-01T00:00:00&end={end}T00:00:00'
+
+
+def op_login(user):
+    return 'POST', '/api/auth/login', {'email': f'user{user.user_id}@example.com', 'password': SEED_PASSWORD}
+
+
+def op_list(user):
+    return 'GET', f'/api/tasks?user_id={user.user_id}&limit=50', None
+
+
+def op_create(user):
+    return 'POST', '/api/tasks', {
+        'title': f'Nueva tarea {user.rng.randrange(10 ** 6)}',
+        'user_id': user.user_id,
+        'priority': user.rng.choice(PRIORITIES),
+        'due_date': f'2024-{user.rng.randint(1, 12):02d}-{user.rng.randint(1, 28):02d}T12:00:00'
+    }
+
+
+def op_update(user):
+    return 'PUT', f'/api/tasks/{user.task_id()}', {'status': user.rng.choice(STATUSES)}
+
+
+def op_calendar(user):
+    return 'GET', f'/api/calendar/tasks?{user.month()}&user_id={user.user_id}', None
+
+
+def op_calendar_summary(user):
+    return 'GET', f'/api/calendar/summary?{user.month()}&user_id={user.user_id}', None
+
+
+def op_report_summary(user):
+    return 'GET', f'/api/reports/summary?user_id={user.user_id}', None
+
+
+def op_report_category(user):
+    return 'GET', f'/api/reports/by-category?user_id={user.user_id}', None
+
+
+# Operación, peso relativo y función que construye (método, ruta, cuerpo)
+OPERATIONS = (
+    ('login', 5, op_login),
+    ('list', 30, op_list),
+    ('create', 10, op_create),
+    ('update', 10, op_update),
+    ('calendar', 10, op_calendar),
+    ('calendar_summary', 10, op_calendar_summary),
+    ('report_summary', 15, op_report_summary),
+    ('report_category', 10, op_report_category),
+)
+
+
+async def _client(user, started, deadline, samples):
+    names = [name for name, _, _ in OPERATIONS]
+    weights = [weight for _, weight, _ in OPERATIONS]
+    builders = {name: build for name, _, build in OPERATIONS}
+    connection = None
+    while time.perf_counter() < deadline:
+        name = user.rng.choices(names, weights)[0]
+        method, path, payload = builders[name](user)
+        body = json.dumps(payload).encode() if payload is not None else None
+        begin = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(HOST, PORT)
+            status, keep_alive, content = await http_request(*connection, path, method, body)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            status, keep_alive, content = None, False, b''
+        elapsed = (time.perf_counter() - begin) * 1000
+        if begin >= started:
+            samples.setdefault(name, []).append((elapsed, status))
+        if name == 'create' and status == 200:
+            user.created.append(json.loads(content)['id'])
+        if not keep_alive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def run_load(args, task_ids):
+    """Devuelve ``{operación: [(ms, estado)]}`` de la ventana medida (sin calentamiento)"""
+    samples = {}
+    now = time.perf_counter()
+    started = now + args.warmup
+    deadline = started + args.seconds
+    users = [VirtualUser(i, args.users, task_ids, args.seed) for i in range(args.clients)]
+    await asyncio.gather(*(_client(user, started, deadline, samples) for user in users))
+    return samples
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista ordenada"""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(samples, seconds):
+    """Métricas por operación y del total a partir de las muestras"""
+    def metrics(entries):
+        latencies = sorted(elapsed for elapsed, _ in entries)
+        errors = sum(1 for _, status in entries if status is None or status >= 400)
+        return {
+            'requests': len(entries),
+            'throughput': round(len(entries) / seconds, 2),
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p95': round(percentile(latencies, 0.95), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'errors': errors,
+            'error_rate': round(errors / len(entries), 4)
+        }
+
+    results = {name: metrics(entries) for name, entries in sorted(samples.items()) if entries}
+    everything = [entry for entries in samples.values() for entry in entries]
+    if everything:
+        results['total'] = metrics(everything)
+    return results
+
+
+def print_table(results):
+    print(f"{'operación':<18}{'peticiones':>11}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errores':>9}")
+    for name, m in results.items():
+        print(f"{name:<18}{m['requests']:>11}{m['throughput']:>9.1f}{m['p50']:>9.1f}"
+              f"{m['p95']:>9.1f}{m['p99']:>9.1f}{m['errors']:>9}")
+
+
+def compare(results, baseline, threshold):
+    """Lista de regresiones respecto a ``baseline``
+
+    Una operación empeora si algún percentil crece más de ``threshold``
+    (y más de ``MIN_DELTA_MS``), si el throughput cae más de ``threshold``
+    o si la tasa de errores sube más de ``MAX_ERROR_RATE_DELTA``.
+    """
+    regressions = []
+    for name, before in baseline.items():
+        after = results.get(name)
+        if after is None:
+            regressions.append(f'{name}: sin peticiones en esta ejecución')
+            continue
+        for key in ('p50', 'p95', 'p99'):
+            if after[key] > before[key] * (1 + threshold) and after[key] - before[key] > MIN_DELTA_MS:
+                regressions.append(f'{name}: {key} {before[key]:.1f} -> {after[key]:.1f} ms')
+        if after['throughput'] < before['throughput'] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['throughput']:.1f} -> {after['throughput']:.1f} req/s")
+        if after['error_rate'] > before['error_rate'] + MAX_ERROR_RATE_DELTA:
+            regressions.append(f"{name}: errores {before['error_rate']:.2%} -> {after['error_rate']:.2%}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga HTTP de la API')
+    parser.add_argument('--users', type=int, default=20, help='usuarios sembrados')
+    parser.add_argument('--tasks', type=int, default=200, help='tareas por usuario')
+    parser.add_argument('--clients', type=int, default=50, help='clientes concurrentes')
+    parser.add_argument('--seconds', type=float, default=30, help='duración de la medición')
+    parser.add_argument('--warmup', type=float, default=2, help='segundos iniciales que no se miden')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--save', metavar='FICHERO', help='guarda el resultado como línea base')
+    parser.add_argument('--baseline', metavar='FICHERO', help='compara con una línea base')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='empeoramiento tolerado (0.25 = 25 %%)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    params = {name: getattr(args, name) for name in ('users', 'tasks', 'clients', 'seconds', 'server', 'seed')}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load.db')
+        task_ids = seed(db_path, args.users, args.tasks, args.seed)
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', SCHEMA_CHECK='off')
+        command = server_commands(PORT)[f'{args.server}:app']
+        server = subprocess.Popen(command, cwd=backend_dir, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready()
+            samples = asyncio.run(run_load(args, task_ids))
+        finally:
+            server.terminate()
+            server.wait()
+
+    results = summarize(samples, args.seconds)
+    print(f"\n=== {args.server}:app, {args.clients} clientes, {args.users} usuarios x "
+          f"{args.tasks} tareas, {args.seconds:.0f} s ===")
+    print_table(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'params': params,
+                'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                                'cpus': os.cpu_count()},
+                'created_at': datetime.utcnow().isoformat(),
+                'results': results
+            }, f, indent=2, sort_keys=True)
+        print(f"\nLínea base guardada en {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['params'] != params:
+            print(f"\nAviso: la línea base se midió con otros parámetros: {baseline['params']}")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\nRegresiones (umbral {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"- {line}")
+            sys.exit(1)
+        print(f"\nSin regresiones respecto a {args.baseline} (umbral {args.threshold:.0%})")
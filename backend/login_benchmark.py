@@ -0,0 +1,103 @@
+"""Latencia del listado de tareas durante una ráfaga de logins
+
+Lanza varios hilos que hacen login sin parar mientras otro hilo pide
+``GET /api/tasks`` y mide su latencia. Se compara el hash de contraseñas
+en línea (``PASSWORD_HASH_WORKERS=0``) con el pool dedicado: con el pool la
+latencia del listado debe mantenerse cerca de la de reposo, porque solo
+unos pocos hashes se calculan a la vez y el resto se rechaza con 503. Los
+clientes que reciben 503 esperan antes de reintentar, como indica
+``Retry-After``.
+
+Uso:
+    python login_benchmark.py [segundos] [hilos_de_login]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from app import create_app
+from models import db, User, Task
+
+PROBE_PATH = '/api/tasks?user_id=1&limit=50'
+RETRY_BACKOFF = 0.1
+MODES = (('hash en línea', 0), ('pool dedicado', 2))
+
+
+def build_app(db_path, workers):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SCHEMA_CHECK': 'off',
+        'PASSWORD_HASH_WORKERS': workers,
+        'PASSWORD_HASH_QUEUE': 4
+    })
+    with app.app_context():
+        db.create_all()
+        if not User.query.first():
+            user = User(username='bench', email='bench@example.com')
+            user.set_password('password')
+            db.session.add(user)
+            db.session.flush()
+            db.session.add_all(Task(title=f'Tarea {i}', user_id=user.id) for i in range(200))
+            db.session.commit()
+    return app
+
+
+def run_phase(app, seconds, login_threads):
+    """Devuelve las latencias del listado (ms) y los códigos de los logins"""
+    stop = threading.Event()
+    statuses = []
+
+    def storm():
+        client = app.test_client()
+        while not stop.is_set():
+            response = client.post('/api/auth/login', json={
+                'email': 'bench@example.com', 'password': 'password'
+            })
+            statuses.append(response.status_code)
+            if response.status_code == 503:
+                time.sleep(RETRY_BACKOFF)
+
+    threads = [threading.Thread(target=storm) for _ in range(login_threads)]
+    for thread in threads:
+        thread.start()
+
+    client = app.test_client()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        client.get(PROBE_PATH)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+def report(name, latencies, statuses, seconds):
+    values = sorted(latencies)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    line = f"- {name}: listado mediana {statistics.median(values):.1f} ms, p95 {p95:.1f} ms"
+    if statuses:
+        ok = statuses.count(200)
+        busy = statuses.count(503)
+        line += f"; logins {ok / seconds:.1f}/s correctos, {busy / seconds:.1f}/s rechazados (503)"
+    print(line)
+
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    login_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        print(f"\n=== Listado de tareas con {login_threads} hilos de login ({seconds:.0f} s por fase) ===")
+        app = build_app(db_path, 0)
+        report('en reposo', *run_phase(app, seconds, 0), seconds)
+        for name, workers in MODES:
+            app = build_app(db_path, workers)
+            report(name, *run_phase(app, seconds, login_threads), seconds)
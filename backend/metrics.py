@@ -0,0 +1,222 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from models import db
+
+# Límites de los histogramas (el último cubo, +Inf, es implícito)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+# Longitud máxima de los parámetros guardados en el registro de consultas lentas
+SLOW_QUERY_PARAMS_LENGTH = 500
+
+
+class Histogram:
+    """Histograma acumulable con cubos fijos, como los de Prometheus"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Pares ``(le, observaciones <= le)`` terminando en ``+Inf``"""
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_time = Histogram(LATENCY_BUCKETS)
+        self.sql_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+
+
+class RequestMetrics:
+    """Métricas por endpoint del proceso y registro de consultas lentas
+
+    Las claves son ``(método, regla de la URL)`` y no la ruta concreta, así
+    que el número de series no crece con los ids. Cada worker lleva sus
+    propias métricas, como cualquier exportador de Prometheus por proceso.
+    """
+
+    def __init__(self, slow_query_ms=200, slow_query_log_size=100, log_parameters=False):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.log_parameters = log_parameters
+        self.slow_queries = deque(maxlen=slow_query_log_size)
+        self.slow_query_total = 0
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def observe_request(self, method, endpoint, status, seconds, sql_queries, sql_seconds, size):
+        with self._lock:
+            metrics = self.endpoints.get((method, endpoint))
+            if metrics is None:
+                metrics = self.endpoints[(method, endpoint)] = EndpointMetrics()
+            metrics.latency.observe(seconds)
+            metrics.sql_queries.observe(sql_queries)
+            metrics.sql_time.observe(sql_seconds)
+            if size is not None:
+                metrics.response_size.observe(size)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def record_slow_query(self, statement, parameters, seconds, endpoint):
+        """Guarda la sentencia y el número de parámetros; los valores solo con ``log_parameters``
+
+        Los parámetros pueden contener emails o hashes de contraseñas, así
+        que por defecto no salen del proceso ni llegan al log.
+        """
+        entry = {
+            'at': datetime.utcnow().isoformat(),
+            'duration_ms': round(seconds * 1000, 2),
+            'endpoint': endpoint,
+            'statement': statement,
+            'parameter_count': len(parameters) if parameters else 0
+        }
+        if self.log_parameters:
+            params = repr(parameters)
+            if len(params) > SLOW_QUERY_PARAMS_LENGTH:
+                params = params[:SLOW_QUERY_PARAMS_LENGTH] + '...'
+            entry['parameters'] = params
+        with self._lock:
+            self.slow_query_total += 1
+            self.slow_queries.append(entry)
+        return entry
+
+    def slow_query_log(self):
+        with self._lock:
+            return list(self.slow_queries)
+
+    def render(self, extra=()):
+        """Todas las métricas en el formato de texto de Prometheus"""
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = []
+            _header(lines, 'http_requests_total', 'counter', 'Peticiones atendidas')
+            for (method, endpoint), metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items()):
+                    labels = _labels(method=method, endpoint=endpoint, status=status)
+                    lines.append(f'http_requests_total{{{labels}}} {count}')
+            for name, attribute, help_text in (
+                ('http_request_duration_seconds', 'latency', 'Tiempo de respuesta'),
+                ('http_request_sql_queries', 'sql_queries', 'Sentencias SQL por petición'),
+                ('http_request_sql_duration_seconds', 'sql_time', 'Tiempo en SQL por petición'),
+                ('http_response_size_bytes', 'response_size', 'Tamaño del cuerpo de la respuesta'),
+            ):
+                _header(lines, name, 'histogram', help_text)
+                for (method, endpoint), metrics in endpoints:
+                    _histogram(lines, name, getattr(metrics, attribute), method=method, endpoint=endpoint)
+            _header(lines, 'db_slow_queries_total', 'counter', 'Consultas más lentas que el umbral')
+            lines.append(f'db_slow_queries_total {self.slow_query_total}')
+
+        for name, kind, help_text, value in extra:
+            _header(lines, name, kind, help_text)
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _header(lines, name, kind, help_text):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+def _histogram(lines, name, histogram, **labels):
+    for bound, count in histogram.cumulative():
+        lines.append(f'{name}_bucket{{{_labels(**labels, le=bound)}}} {count}')
+    lines.append(f'{name}_sum{{{_labels(**labels)}}} {float(histogram.sum)!r}')
+    lines.append(f'{name}_count{{{_labels(**labels)}}} {histogram.count}')
+
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def _register_query_hooks(engine, metrics, logger):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info['query_started'].pop()
+        in_request = has_request_context()
+        if in_request and '_sql_queries' in g:
+            g._sql_queries += 1
+            g._sql_seconds += seconds
+        if seconds >= metrics.slow_query_seconds:
+            endpoint = _endpoint() if in_request else None
+            entry = metrics.record_slow_query(statement, parameters, seconds, endpoint)
+            logger.warning('Consulta lenta (%.1f ms) en %s: %s %s',
+                           entry['duration_ms'], endpoint, statement, entry.get('parameters', ''))
+
+
+def init_metrics(app):
+    """Instrumenta la aplicación: latencia, SQL y tamaño por endpoint
+
+    Los hooks ``before/after_cursor_execute`` del engine cuentan las
+    sentencias y su tiempo en la petición en curso (en ``g``); al terminar
+    la petición se acumula todo en los histogramas del endpoint. Con
+    ``METRICS_QUERY_HEADER`` (solo para depurar) la respuesta incluye
+    ``X-Query-Count`` y ``X-Query-Time``. Las respuestas en streaming no
+    tienen tamaño conocido y solo cuentan hasta que empieza la transmisión.
+    """
+    if not app.config['METRICS_ENABLED']:
+        app.extensions['metrics'] = None
+        return
+
+    metrics = app.extensions['metrics'] = RequestMetrics(
+        app.config['METRICS_SLOW_QUERY_MS'], app.config['METRICS_SLOW_QUERY_LOG_SIZE'],
+        app.config['METRICS_SLOW_QUERY_PARAMS']
+    )
+    with app.app_context():
+        _register_query_hooks(db.engine, metrics, app.logger)
+    query_header = app.config['METRICS_QUERY_HEADER']
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_started = time.perf_counter()
+        g._sql_queries = 0
+        g._sql_seconds = 0.0
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return response
+        metrics.observe_request(
+            request.method, _endpoint(), response.status_code, time.perf_counter() - started,
+            g._sql_queries, g._sql_seconds, response.content_length
+        )
+        if query_header:
+            response.headers['X-Query-Count'] = str(g._sql_queries)
+            response.headers['X-Query-Time'] = f'{g._sql_seconds * 1000:.2f}ms'
+        return response
+
+
+def request_metrics():
+    return current_app.extensions.get('metrics')
@@ -0,0 +1,38 @@
+"""add task_stats
+
+Revision ID: 00922b794b9f
+Revises: b060e4cb8dae
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '00922b794b9f'
+down_revision = 'b060e4cb8dae'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'status', 'category', 'priority')
+    )
+    # Poblar la tabla con las tareas ya existentes
+    op.execute(
+        "INSERT INTO task_stats (user_id, status, category, priority, task_count) "
+        "SELECT user_id, COALESCE(status, ''), COALESCE(category, ''), COALESCE(priority, ''), COUNT(id) "
+        "FROM task GROUP BY user_id, COALESCE(status, ''), COALESCE(category, ''), COALESCE(priority, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('task_stats')
@@ -0,0 +1,106 @@
+"""normalize task tags
+
+Revision ID: 4f1d2a9c7e35
+Revises: 8c632a2b31ba
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f1d2a9c7e35'
+down_revision = '8c632a2b31ba'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def _parse_tags(value):
+    # Copia de models.parse_tags: las migraciones no dependen del código actual.
+    # Acepta tanto el formato JSON de db_seed.py como "a,b,c".
+    if not value:
+        return []
+    text = value.strip()
+    if text.startswith('['):
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = text.strip('[]').split(',')
+    else:
+        items = text.split(',')
+    names = []
+    for name in items:
+        name = str(name).strip().strip('"\'').strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def upgrade():
+    op.create_table('tag',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('task_tag',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tag.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'tag_id')
+    )
+
+    # Migrar las etiquetas existentes por lotes, normalizando también la
+    # columna task.tags al formato separado por comas
+    connection = op.get_bind()
+    task = sa.table('task', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+    tag = sa.table('tag', sa.column('id', sa.Integer), sa.column('name', sa.String))
+    task_tag = sa.table('task_tag', sa.column('task_id', sa.Integer), sa.column('tag_id', sa.Integer))
+
+    tag_ids = {}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(task.c.id, task.c.tags)
+            .where(task.c.id > last_id, task.c.tags.isnot(None))
+            .order_by(task.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        parsed = {row.id: _parse_tags(row.tags) for row in rows}
+        new_names = {name for names in parsed.values() for name in names} - set(tag_ids)
+        if new_names:
+            connection.execute(tag.insert(), [{'name': name} for name in sorted(new_names)])
+            tag_ids.update(connection.execute(
+                sa.select(tag.c.name, tag.c.id).where(tag.c.name.in_(new_names))
+            ).all())
+
+        links = [{'task_id': task_id, 'tag_id': tag_ids[name]}
+                 for task_id, names in parsed.items() for name in names]
+        if links:
+            connection.execute(task_tag.insert(), links)
+
+        normalized = [{'task_id': row.id, 'tags': ','.join(parsed[row.id]) or None}
+                      for row in rows if (','.join(parsed[row.id]) or None) != row.tags]
+        if normalized:
+            connection.execute(
+                task.update().where(task.c.id == sa.bindparam('task_id')).values(tags=sa.bindparam('tags')),
+                normalized
+            )
+
+    # El índice se crea al final para no mantenerlo durante la carga
+    op.create_index('ix_task_tag_tag_id_task_id', 'task_tag', ['tag_id', 'task_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_tag_tag_id_task_id', table_name='task_tag')
+    op.drop_table('task_tag')
+    op.drop_table('tag')
@@ -0,0 +1,37 @@
+"""add task indexes
+
+Revision ID: 8c632a2b31ba
+Revises: 00922b794b9f
+Create Date: 2026-10-18 10:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c632a2b31ba'
+down_revision = '00922b794b9f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id_status', ['user_id', 'status'], unique=False)
+        batch_op.create_index('ix_task_user_id_due_date', ['user_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_task_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+        batch_op.create_index('ix_task_category_status', ['category', 'status'], unique=False)
+        batch_op.create_index('ix_task_completed_date', ['completed_date'], unique=False)
+        batch_op.create_index('ix_task_due_date', ['due_date'], unique=False)
+        batch_op.create_index('ix_task_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_updated_at')
+        batch_op.drop_index('ix_task_due_date')
+        batch_op.drop_index('ix_task_completed_date')
+        batch_op.drop_index('ix_task_category_status')
+        batch_op.drop_index('ix_task_user_id_updated_at')
+        batch_op.drop_index('ix_task_user_id_due_date')
+        batch_op.drop_index('ix_task_user_id_status')
@@ -0,0 +1,53 @@
+"""add task full-text search index
+
+Revision ID: 9e7b3c5d1f08
+Revises: 4f1d2a9c7e35
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e7b3c5d1f08'
+down_revision = '4f1d2a9c7e35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""CREATE VIRTUAL TABLE task_fts USING fts5(
+        title, description, tags,
+        content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""")
+    op.execute("""CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""")
+    op.execute("""CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+    END""")
+    op.execute("""CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description, tags ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+        INSERT INTO task_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""")
+    # Indexar las tareas existentes
+    op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS task_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS task_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS task_fts_ai')
+    op.execute('DROP TABLE IF EXISTS task_fts')
@@ -0,0 +1,57 @@
+"""add task change_seq and tombstones
+
+Revision ID: d5b9f1e3a620
+Revises: c3a8e6f2d417
+Create Date: 2026-10-18 10:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b9f1e3a620'
+down_revision = 'c3a8e6f2d417'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ALTER TABLE directo: en SQLite un batch recrearía la tabla task y
+    # perdería los triggers del índice FTS
+    op.add_column('task', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    # Las tareas existentes reciben una versión distinta cada una (su id) y la
+    # versión global avanza hasta la mayor, para que los cambios posteriores
+    # sigan ordenados después de ellas
+    op.execute('UPDATE task SET change_seq = id')
+    op.execute('UPDATE data_version SET version = (SELECT MAX(id) FROM task) '
+               'WHERE scope = 0 AND version < (SELECT MAX(id) FROM task)')
+    op.execute('INSERT INTO data_version (scope, version) SELECT 0, MAX(id) FROM task '
+               'WHERE NOT EXISTS (SELECT 1 FROM data_version WHERE scope = 0) HAVING MAX(id) IS NOT NULL')
+    op.create_index('ix_task_user_id_change_seq', 'task', ['user_id', 'change_seq'], unique=False)
+    op.create_index('ix_task_change_seq', 'task', ['change_seq'], unique=False)
+
+    op.create_table('task_tombstone',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.create_index('ix_task_tombstone_user_id_change_seq', ['user_id', 'change_seq'], unique=False)
+        batch_op.create_index('ix_task_tombstone_change_seq', ['change_seq'], unique=False)
+        batch_op.create_index('ix_task_tombstone_deleted_at', ['deleted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_tombstone_deleted_at')
+        batch_op.drop_index('ix_task_tombstone_change_seq')
+        batch_op.drop_index('ix_task_tombstone_user_id_change_seq')
+    op.drop_table('task_tombstone')
+
+    op.drop_index('ix_task_change_seq', table_name='task')
+    op.drop_index('ix_task_user_id_change_seq', table_name='task')
+    # Requiere SQLite 3.35+; igual que en upgrade se evita recrear la tabla
+    op.drop_column('task', 'change_seq')
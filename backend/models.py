@@ -1,9 +1,35 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+import json
+from passwords import password_hasher
 
 db = SQLAlchemy()
 
+def parse_tags(value):
+    """Convierte etiquetas en lista aceptando lista, JSON o texto separado por comas
+
+    Elimina espacios, vacíos y duplicados conservando el orden.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text.strip('[]').split(',')
+        else:
+            value = text.split(',')
+
+    names = []
+    for name in value:
+        name = str(name).strip().strip('"\'').strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -13,10 +39,10 @@ class User(db.Model):
     tasks = db.relationship('Task', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher().hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher().verify(self.password_hash, password)
 
     def to_dict(self):
         return {
@@ -27,6 +53,21 @@ class User(db.Model):
         }
 
 class Task(db.Model):
+    __table_args__ = (
+        # Listados, conteos y calendario por usuario
+        db.Index('ix_task_user_id_status', 'user_id', 'status'),
+        db.Index('ix_task_user_id_due_date', 'user_id', 'due_date'),
+        db.Index('ix_task_user_id_updated_at', 'user_id', 'updated_at'),
+        # Reportes globales
+        db.Index('ix_task_category_status', 'category', 'status'),
+        db.Index('ix_task_completed_date', 'completed_date'),
+        db.Index('ix_task_due_date', 'due_date'),
+        db.Index('ix_task_updated_at', 'updated_at'),
+        # Sincronización incremental (GET /api/tasks/changes)
+        db.Index('ix_task_user_id_change_seq', 'user_id', 'change_seq'),
+        db.Index('ix_task_change_seq', 'change_seq'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -39,8 +80,18 @@ class Task(db.Model):
     category = db.Column(db.String(50), default='general')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    tags = db.Column(db.String(500))  # Almacenaremos las etiquetas como una cadena separada por comas
+    # Copia de las etiquetas separadas por comas para mostrarlas; las consultas
+    # por etiqueta usan las tablas tag y task_tag (ver tags.py)
+    tags = db.Column(db.String(500))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # Versión global (data_version, scope 0) de la transacción que modificó la
+    # tarea por última vez; la asigna versions.py
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    @validates('tags')
+    def _normalize_tags(self, key, value):
+        # Acepta listas, JSON o texto separado por comas y guarda siempre "a,b,c"
+        return ','.join(parse_tags(value)) or None
 
     def to_dict(self):
         return {
@@ -61,9 +112,99 @@ class Task(db.Model):
             'username': self.user.username
         }
 
+    @classmethod
+    def from_payload(cls, data, user_id):
+        """Crea una tarea a partir del JSON de ``POST /api/tasks``"""
+        return cls(
+            title=data['title'],
+            description=data.get('description'),
+            status=data.get('status', 'pending'),
+            priority=data.get('priority', 'medium'),
+            due_date=datetime.fromisoformat(data['due_date']) if data.get('due_date') else None,
+            estimated_hours=data.get('estimated_hours', 0),
+            actual_hours=data.get('actual_hours', 0),
+            category=data.get('category', 'general'),
+            tags=','.join(data.get('tags', [])),
+            user_id=user_id
+        )
+
+    def apply_payload(self, data):
+        """Aplica los cambios del JSON de ``PUT /api/tasks/<id>``"""
+        self.title = data.get('title', self.title)
+        self.description = data.get('description', self.description)
+        self.priority = data.get('priority', self.priority)
+        self.due_date = datetime.fromisoformat(data['due_date']) if data.get('due_date') else self.due_date
+        self.estimated_hours = data.get('estimated_hours', self.estimated_hours)
+        self.actual_hours = data.get('actual_hours', self.actual_hours)
+        self.category = data.get('category', self.category)
+        self.tags = ','.join(data.get('tags', [])) if data.get('tags') else self.tags
+
+        if 'status' in data:
+            self.update_status(data['status'])
+
     def update_status(self, new_status):
         self.status = new_status
-        if new_status == 'completed' and not self.completed_date:
-            self.completed_date = datetime.utcnow()
-        elif new_status != 'completed':
-            self.completed_date = None 
\ No newline at end of file
+        self.completed_date = Task.completed_date_for(new_status, self.completed_date)
+
+    @staticmethod
+    def completed_date_for(new_status, completed_date, now=None):
+        """Fecha de completitud tras pasar al estado ``new_status``
+
+        Se conserva la fecha si la tarea ya estaba completada, se asigna la
+        actual al completarla y se borra en cualquier otro estado.
+        """
+        if new_status == 'completed':
+            return completed_date or now or datetime.utcnow()
+        return None
+
+class TaskStats(db.Model):
+    """Conteo materializado de tareas por (usuario, estado, categoría, prioridad)
+
+    Se mantiene sincronizado desde ``stats.py`` en la misma transacción que
+    modifica las tareas. Los valores nulos se guardan como cadena vacía para
+    que puedan formar parte de la clave primaria.
+    """
+    __tablename__ = 'task_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    priority = db.Column(db.String(20), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+
+task_tag = db.Table(
+    'task_tag',
+    db.Column('task_id', db.Integer, db.ForeignKey('task.id'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id'), primary_key=True),
+    # Búsqueda de tareas por etiqueta sin tocar la tabla task
+    db.Index('ix_task_tag_tag_id_task_id', 'tag_id', 'task_id')
+)
+
+class DataVersion(db.Model):
+    """Contador de cambios por usuario (scope = user_id) y global (scope = 0)
+
+    Se incrementa en cada escritura sobre ``task`` desde ``versions.py`` y
+    sirve para generar ETags y claves de caché sin consultar las tareas.
+    """
+    __tablename__ = 'data_version'
+
+    scope = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class TaskTombstone(db.Model):
+    """Registro compacto de una tarea eliminada para la sincronización incremental"""
+    __tablename__ = 'task_tombstone'
+    __table_args__ = (
+        db.Index('ix_task_tombstone_user_id_change_seq', 'user_id', 'change_seq'),
+        db.Index('ix_task_tombstone_change_seq', 'change_seq'),
+        db.Index('ix_task_tombstone_deleted_at', 'deleted_at'),
+    )
+
+    task_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    change_seq = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
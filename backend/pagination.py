@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from models import Task
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STREAM_CHUNK_SIZE = 500
+
+# Columnas por las que se puede paginar el listado. updated_at se recorre de
+# más reciente a más antiguo; due_date en orden ascendente con las tareas sin
+# fecha al final.
+SORT_KEYS = ('updated_at', 'due_date')
+# Claves que se recorren en orden descendente y nunca son nulas en la consulta
+_DESC_KEYS = ('updated_at', 'completed_date')
+
+
+def parse_limit(value):
+    """Normaliza el parámetro ``limit`` al rango [1, MAX_LIMIT]"""
+    if value is None:
+        return DEFAULT_LIMIT
+    limit = int(value)
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def encode_cursor(task, sort):
+    """Genera un cursor opaco con la clave (columna de orden, id) de la tarea"""
+    value = getattr(task, sort)
+    payload = [value.isoformat() if value else None, task.id]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodifica un cursor generado por ``encode_cursor``
+
+    Lanza ``ValueError`` si el cursor no es válido.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        value = datetime.fromisoformat(value) if value is not None else None
+        return value, int(task_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def order_by_key(query, sort):
+    """Aplica el orden estable correspondiente a la clave de paginación"""
+    if sort in _DESC_KEYS:
+        return query.order_by(getattr(Task, sort).desc(), Task.id.desc())
+    return query.order_by(Task.due_date.is_(None), Task.due_date.asc(), Task.id.asc())
+
+
+def apply_keyset(query, sort, cursor):
+    """Filtra la consulta para continuar justo después del cursor indicado
+
+    Usa comparaciones sobre (columna, id) en lugar de OFFSET, de modo que el
+    coste de cada página no depende de lo lejos que esté en el listado.
+    """
+    if not cursor:
+        return order_by_key(query, sort)
+
+    value, last_id = decode_cursor(cursor)
+
+    if sort in _DESC_KEYS:
+        column = getattr(Task, sort)
+        query = query.filter(or_(
+            column < value,
+            and_(column == value, Task.id < last_id)
+        ))
+    elif value is None:
+        # Ya estamos en el tramo final de tareas sin fecha de vencimiento
+        query = query.filter(Task.due_date.is_(None), Task.id > last_id)
+    else:
+        query = query.filter(or_(
+            Task.due_date > value,
+            and_(Task.due_date == value, Task.id > last_id),
+            Task.due_date.is_(None)
+        ))
+
+    return order_by_key(query, sort)
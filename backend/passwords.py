@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from config import Config
+
+
+class PasswordPoolBusy(Exception):
+    """El pool de hash está saturado; la petición debe rechazarse con 503"""
+
+
+def _executor_class():
+    # Con gevent (serve.py) los hilos de threading son greenlets y PBKDF2
+    # bloquearía el bucle de eventos; su ThreadPoolExecutor usa hilos reales
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+    if monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+        return GeventThreadPoolExecutor
+    return ThreadPoolExecutor
+
+
+class PasswordHasher:
+    """Calcula y verifica hashes de contraseñas en un pool de hilos acotado
+
+    Como mucho ``workers`` hashes se calculan a la vez (``hashlib`` libera
+    el GIL durante PBKDF2) y ``max_pending`` esperan turno; si no queda
+    hueco se lanza ``PasswordPoolBusy`` al instante en lugar de encolar, de
+    modo que una ráfaga de logins no acapara los workers del servidor. Con
+    ``workers=0`` el hash se calcula en el hilo que llama.
+    """
+
+    def __init__(self, method, workers=2, max_pending=16):
+        self.method = method
+        self.workers = workers
+        self._executor = _executor_class()(
+            max_workers=workers, thread_name_prefix='password-hash'
+        ) if workers else None
+        self._slots = threading.BoundedSemaphore(workers + max_pending) if workers else None
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy('Too many concurrent password operations')
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    async def _run_async(self, fn, *args):
+        """Como ``_run`` pero esperando el resultado sin bloquear el bucle de eventos"""
+        if self._executor is None:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy('Too many concurrent password operations')
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    async def hash_async(self, password):
+        return await self._run_async(generate_password_hash, password, self.method)
+
+    async def verify_async(self, pwhash, password):
+        return await self._run_async(check_password_hash, pwhash, password)
+
+    @cached_property
+    def _method_prefix(self):
+        # Werkzeug guarda el método expandido ("scrypt" -> "scrypt:32768:8:1",
+        # "pbkdf2:sha256" -> "pbkdf2:sha256:<iteraciones>"): se obtiene una sola
+        # vez generando un hash con el método configurado
+        return generate_password_hash('', self.method).split('$', 1)[0]
+
+    def needs_rehash(self, pwhash):
+        """Indica si el hash se generó con parámetros distintos de los configurados"""
+        return pwhash.split('$', 1)[0] != self._method_prefix
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def init_password_hasher(app):
+    """Crea el pool de hash de la aplicación con su configuración"""
+    app.extensions['password_hasher'] = PasswordHasher(
+        app.config['PASSWORD_HASH_METHOD'],
+        app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_QUEUE']
+    )
+
+
+# Fuera de una aplicación (scripts sin contexto) el hash se calcula en línea
+_inline_hasher = PasswordHasher(Config.PASSWORD_HASH_METHOD, workers=0)
+
+
+def password_hasher():
+    if has_app_context() and 'password_hasher' in current_app.extensions:
+        return current_app.extensions['password_hasher']
+    return _inline_hasher
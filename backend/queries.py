@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from models import Task
+from pagination import SORT_KEYS, parse_limit, encode_cursor, apply_keyset
+from reports import bucket_expression, bucket_key
+from serializers import parse_fields, task_select, row_to_dict
+from tags import TAG_MODES, filter_by_tags
+
+# Sentencias de lectura compartidas por la aplicación WSGI (routes/) y la
+# ASGI (asgi.py): reciben los parámetros de la petición (cualquier objeto con
+# get/getlist) y devuelven un select() que cada una ejecuta con su sesión.
+# Los parámetros inválidos lanzan ValueError con el mensaje para el 400.
+
+# Campos por defecto del calendario: lo que muestra una celda del mes o la semana
+CALENDAR_FIELDS = ('id', 'title', 'status', 'priority', 'due_date')
+# Intervalo máximo de /api/calendar/summary
+CALENDAR_MAX_DAYS = 366
+
+
+def task_list_statement(args, stream=False):
+    """Listado de tareas: devuelve ``(sentencia, campos, sort, limit)``
+
+    Con ``stream`` no se pagina y ``limit`` es ``None``; si no, la sentencia
+    pide una fila extra para saber si existe una página siguiente.
+    """
+    sort = args.get('sort', 'updated_at')
+    if sort not in SORT_KEYS:
+        raise ValueError(f'Invalid sort, expected one of: {", ".join(SORT_KEYS)}')
+
+    fields = parse_fields(args.get('fields'))
+
+    tag_mode = args.get('tag_mode', 'all')
+    if tag_mode not in TAG_MODES:
+        raise ValueError(f'Invalid tag_mode, expected one of: {", ".join(TAG_MODES)}')
+
+    # Las claves de paginación se seleccionan siempre aunque no se devuelvan
+    stmt = task_select(fields, extra=('id', sort))
+    user_id = args.get('user_id')
+    if user_id:
+        stmt = stmt.filter(Task.user_id == user_id)
+    stmt = filter_by_tags(stmt, args.getlist('tag'), tag_mode)
+
+    if stream:
+        return apply_keyset(stmt, sort, None), fields, sort, None
+
+    try:
+        limit = parse_limit(args.get('limit'))
+        stmt = apply_keyset(stmt, sort, args.get('cursor'))
+    except ValueError:
+        raise ValueError('Invalid limit or cursor')
+    return stmt.limit(limit + 1), fields, sort, limit
+
+
+def task_page(rows, fields, sort, limit):
+    """Cuerpo de una página keyset a partir de las ``limit + 1`` filas leídas"""
+    return {
+        'tasks': [row_to_dict(row, fields) for row in rows[:limit]],
+        'next_cursor': encode_cursor(rows[limit - 1], sort) if len(rows) > limit else None
+    }
+
+
+def calendar_statement(args):
+    """Tareas con vencimiento entre ``start`` y ``end``: devuelve ``(sentencia, campos)``
+
+    Por defecto solo se seleccionan ``CALENDAR_FIELDS``; con ``user_id`` se
+    limita a las tareas del usuario y el rango se resuelve con el índice
+    ``(user_id, due_date)``.
+    """
+    fields = parse_fields(args.get('fields'), default=CALENDAR_FIELDS)
+    stmt = task_select(fields, extra=('id', 'due_date'))
+
+    user_id = args.get('user_id')
+    if user_id:
+        stmt = stmt.filter(Task.user_id == user_id)
+
+    start_date, end_date = args.get('start'), args.get('end')
+    if start_date and end_date:
+        start = datetime.fromisoformat(start_date)
+        end = datetime.fromisoformat(end_date)
+        stmt = stmt.filter(Task.due_date.between(start, end))
+    return stmt.order_by(Task.due_date, Task.id), fields
+
+
+def calendar_summary_statement(args, dialect):
+    """Conteos por día, estado y prioridad: devuelve ``(start, end, sentencia)``
+
+    ``start`` y ``end`` son obligatorios y el intervalo no puede superar
+    ``CALENDAR_MAX_DAYS``. Es una única consulta agrupada sobre el rango de
+    ``due_date``; ``calendar_summary`` pliega las filas por día.
+    """
+    start_date, end_date = args.get('start'), args.get('end')
+    if not start_date or not end_date:
+        raise ValueError('start and end are required')
+    start = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date)
+    if start > end:
+        raise ValueError('start must be before end')
+    if end - start > timedelta(days=CALENDAR_MAX_DAYS):
+        raise ValueError(f'Range too large, maximum is {CALENDAR_MAX_DAYS} days')
+
+    day = bucket_expression(Task.due_date, 'day', dialect)
+    stmt = select(day, Task.status, Task.priority, func.count(Task.id)).filter(
+        Task.due_date.between(start, end)
+    )
+    user_id = args.get('user_id')
+    if user_id:
+        stmt = stmt.filter(Task.user_id == user_id)
+    return start, end, stmt.group_by(day, Task.status, Task.priority)
+
+
+def calendar_summary(start, end, rows):
+    """Agrupa las filas ``(día, estado, prioridad, n)`` en un objeto por día con tareas"""
+    days = {}
+    for value, status, priority, count in rows:
+        day = days.setdefault(bucket_key(value), {'total': 0, 'by_status': {}, 'by_priority': {}})
+        day['total'] += count
+        day['by_status'][status] = day['by_status'].get(status, 0) + count
+        day['by_priority'][priority] = day['by_priority'].get(priority, 0) + count
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'total': sum(day['total'] for day in days.values()),
+        'days': [dict(day, date=key) for key, day in sorted(days.items())]
+    }
+
+
+def export_statement(args):
+    """Exportación completa de tareas: devuelve ``(sentencia, campos)``
+
+    Sin paginar y en orden de id, para leerla con un cursor del servidor.
+    Acepta los filtros ``user_id``, ``status``, ``priority``, ``category`` y
+    ``tag``/``tag_mode``.
+    """
+    fields = parse_fields(args.get('fields'))
+
+    tag_mode = args.get('tag_mode', 'all')
+    if tag_mode not in TAG_MODES:
+        raise ValueError(f'Invalid tag_mode, expected one of: {", ".join(TAG_MODES)}')
+
+    stmt = task_select(fields)
+    for name in ('user_id', 'status', 'priority', 'category'):
+        value = args.get(name)
+        if value:
+            stmt = stmt.filter(getattr(Task, name) == value)
+    stmt = filter_by_tags(stmt, args.getlist('tag'), tag_mode)
+    return stmt.order_by(Task.id), fields
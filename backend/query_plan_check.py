@@ -0,0 +1,156 @@
+"""Comprueba con EXPLAIN QUERY PLAN que las consultas de la API usan índices
+
+Ejecuta cada endpoint con el cliente de pruebas de Flask sobre una base de
+datos en memoria, captura las sentencias SQL que emite y pide a SQLite el
+plan de cada una. Falla si alguna recorre completa la tabla ``task`` sin
+apoyarse en un índice.
+
+``assert_indexed(app)`` hace la comprobación desde una prueba o un paso de
+CI; el script es solo la interfaz de línea de comandos.
+
+Uso:
+    python query_plan_check.py
+"""
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import create_app
+from config import TestConfig
+from models import db
+
+# Tablas que nunca deberían recorrerse completas
+WATCHED_TABLES = ('task',)
+
+# Peticiones representativas de cada endpoint de lectura
+ENDPOINT_REQUESTS = [
+    '/api/tasks?user_id=1',
+    '/api/tasks?user_id=1&sort=due_date',
+    '/api/tasks',
+    '/api/tasks?tag=bug',
+    '/api/tasks?tag=bug&tag=ui&user_id=1',
+    '/api/tasks?tag=bug&tag=ui&tag_mode=any&user_id=1',
+    '/api/tags',
+    '/api/tags?user_id=1',
+    '/api/tasks/search?q=tarea',
+    '/api/tasks/search?q=tarea&user_id=1',
+    '/api/tasks/changes?since=0',
+    '/api/tasks/changes?since=0&user_id=1',
+    '/api/calendar/tasks?start=2024-01-01T00:00:00&end=2024-02-01T00:00:00',
+    '/api/calendar/tasks?start=2024-01-01T00:00:00&end=2024-02-01T00:00:00&user_id=1',
+    '/api/calendar/summary?start=2024-01-01T00:00:00&end=2024-02-01T00:00:00',
+    '/api/calendar/summary?start=2024-01-01T00:00:00&end=2024-02-01T00:00:00&user_id=1',
+    '/api/reports/summary',
+    '/api/reports/summary?user_id=1',
+    '/api/reports/by-category',
+    '/api/reports/time-tracking',
+    '/api/reports/time-tracking?user_id=1',
+    '/api/reports/productivity?period=year',
+    '/api/reports/productivity?period=month&user_id=1',
+    '/api/reports/analytics',
+    '/api/reports/analytics?user_id=1&days=30',
+    '/api/export/tasks?user_id=1',
+    '/api/export/tasks?user_id=1&status=completed&format=parquet',
+]
+
+
+@contextmanager
+def capture_statements(engine):
+    """Registra las sentencias SELECT ejecutadas sobre ``engine``"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def explain(connection, statement, parameters):
+    """Devuelve las líneas de detalle de EXPLAIN QUERY PLAN"""
+    cursor = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, tuple(parameters or ()))
+    return [row[-1] for row in cursor]
+
+
+def full_scans(plan):
+    """Filtra los pasos del plan que recorren una tabla vigilada sin índice"""
+    scans = []
+    for detail in plan:
+        words = detail.split()
+        if len(words) >= 2 and words[0] == 'SCAN' and words[1] in WATCHED_TABLES and 'INDEX' not in words:
+            scans.append(detail)
+    return scans
+
+
+def check_query_plans(app=None, paths=ENDPOINT_REQUESTS):
+    """Ejecuta los endpoints y devuelve ``[(ruta, sentencia, pasos)]`` con escaneos completos
+
+    Sin ``app`` se usa una base de datos en memoria con el esquema de los
+    modelos: los planes no dependen de los datos y así no se toca la base de
+    datos real. Con ``app`` (por ejemplo, la de una prueba) se crean las
+    tablas que falten en su base de datos.
+    """
+    failures = []
+    app = app or create_app(TestConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        # create_all también crea task_fts y sus triggers (eventos de search.py)
+        db.create_all()
+        for path in paths:
+            with capture_statements(db.engine) as statements:
+                response = client.get(path)
+                # Las respuestas en streaming ejecutan sus consultas al leer el cuerpo
+                response.get_data()
+            if response.status_code >= 400:
+                failures.append((path, None, [f'HTTP {response.status_code}']))
+                continue
+
+            with db.engine.connect() as connection:
+                for statement, parameters in statements:
+                    scans = full_scans(explain(connection, statement, parameters))
+                    if scans:
+                        failures.append((path, statement, scans))
+
+    return failures
+
+
+def format_failures(failures):
+    """Informe legible de los escaneos completos encontrados"""
+    lines = []
+    for path, statement, scans in failures:
+        lines.append(f"\n[FULL SCAN] {path}")
+        if statement:
+            lines.append(f"  {' '.join(statement.split())}")
+        lines.extend(f"  -> {detail}" for detail in scans)
+    lines.append(f"\n{len(failures)} consultas sin índice")
+    return '\n'.join(lines)
+
+
+def assert_indexed(app=None, paths=ENDPOINT_REQUESTS):
+    """Lanza ``AssertionError`` si alguna consulta de ``paths`` recorre una tabla vigilada sin índice
+
+    Pensada para llamarse desde una prueba o un paso de CI, por ejemplo
+    ``assert_indexed(create_app(TestConfig))``.
+    """
+    failures = check_query_plans(app, paths)
+    if failures:
+        raise AssertionError(format_failures(failures))
+
+
+def main():
+    try:
+        assert_indexed()
+    except AssertionError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Todas las consultas de {len(ENDPOINT_REQUESTS)} endpoints usan índices")
+
+
+if __name__ == '__main__':
+    main()
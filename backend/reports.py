@@ -0,0 +1,293 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, func, select
+
+from models import Task, TaskStats, User
+from pagination import parse_limit, apply_keyset
+from serializers import parse_fields, task_select
+
+GRANULARITIES = ('day', 'week', 'month')
+PERIODS = {'week': 7, 'month': 30, 'year': 365}
+# Duración máxima de la ventana por granularidad: como mucho unos 366
+# periodos que rellenar con ceros en cada petición
+MAX_WINDOW_DAYS = {'day': 366, 'week': 366 * 7, 'month': 366 * 31}
+
+
+def parse_window(args, now=None):
+    """Obtiene el intervalo [start, end] de ``start``/``end`` o de ``period``
+
+    Lanza ``ValueError`` si las fechas no son válidas.
+    """
+    now = now or datetime.utcnow()
+    start, end = args.get('start'), args.get('end')
+
+    if start or end:
+        end = datetime.fromisoformat(end) if end else now
+        start = datetime.fromisoformat(start) if start else end - timedelta(days=PERIODS['week'])
+    else:
+        period = args.get('period', 'week')
+        end = now
+        start = now - timedelta(days=PERIODS.get(period, PERIODS['year']))
+
+    if start > end:
+        raise ValueError('start must be before end')
+    return start, end
+
+
+def accuracy_rate(estimated, actual):
+    """Porcentaje de horas estimadas sobre horas reales"""
+    return (estimated / actual * 100) if actual else 0
+
+
+def tracked_estimated_hours():
+    """Horas estimadas solo de las tareas con horas reales registradas (numerador de la precisión)"""
+    return func.sum(case((Task.actual_hours.isnot(None), Task.estimated_hours), else_=0))
+
+
+def bucket_expression(column, granularity, dialect):
+    """Expresión SQL que agrupa una fecha en su día, semana (lunes) o mes"""
+    if dialect == 'postgresql':
+        return func.date(func.date_trunc(granularity, column))
+    if granularity == 'week':
+        return func.date(column, '-6 days', 'weekday 1')
+    if granularity == 'month':
+        return func.strftime('%Y-%m-01', column)
+    return func.date(column)
+
+
+def bucket_start(value, granularity):
+    """Equivalente en Python de ``bucket_expression`` para una fecha"""
+    if granularity == 'week':
+        return value - timedelta(days=value.weekday())
+    if granularity == 'month':
+        return value.replace(day=1)
+    return value
+
+
+def iter_buckets(start, end, granularity):
+    """Genera las claves de todos los periodos entre ``start`` y ``end``"""
+    current = bucket_start(start.date(), granularity)
+    last = end.date()
+    while current <= last:
+        yield current.isoformat()
+        if granularity == 'day':
+            current += timedelta(days=1)
+        elif granularity == 'week':
+            current += timedelta(days=7)
+        elif current.month == 12:
+            current = date(current.year + 1, 1, 1)
+        else:
+            current = date(current.year, current.month + 1, 1)
+
+
+def bucket_key(value):
+    """Normaliza el valor devuelto por la base de datos a ``YYYY-MM-DD``"""
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+
+def zero_fill(rows, start, end, granularity):
+    """Completa con ceros los periodos sin tareas completadas
+
+    ``rows`` son tuplas (periodo, completadas, horas) ya agrupadas en SQL.
+    """
+    found = {bucket_key(bucket): (completed, hours or 0) for bucket, completed, hours in rows}
+    return [{
+        'date': key,
+        'completed': found.get(key, (0, 0))[0],
+        'hours': found.get(key, (0, 0))[1]
+    } for key in iter_buckets(start, end, granularity)]
+
+
+# Sentencias y formato de cada reporte, compartidos por la aplicación WSGI
+# (routes/reports.py) y la ASGI (asgi.py). Los parámetros inválidos lanzan
+# ValueError con el mensaje para el 400.
+
+def summary_statements(user_id, now=None):
+    """Conteos por estado (desde ``task_stats``) y número de tareas vencidas"""
+    by_status = select(TaskStats.status, func.sum(TaskStats.task_count))
+    if user_id:
+        by_status = by_status.filter(TaskStats.user_id == user_id)
+    by_status = by_status.group_by(TaskStats.status)
+
+    # Las tareas vencidas dependen de la hora actual y no se pueden materializar
+    overdue = select(func.count(Task.id)).filter(
+        Task.due_date < (now or datetime.utcnow()),
+        Task.status != 'completed'
+    )
+    if user_id:
+        overdue = overdue.filter(Task.user_id == user_id)
+    return by_status, overdue
+
+
+def summary_report(status_rows, overdue_tasks):
+    by_status = dict(status_rows)
+    total_tasks = sum(by_status.values())
+    completed_tasks = by_status.get('completed', 0)
+    return {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'pending_tasks': by_status.get('pending', 0),
+        'in_progress_tasks': by_status.get('in_progress', 0),
+        'overdue_tasks': overdue_tasks,
+        'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    }
+
+
+def category_statement(user_id):
+    total = func.sum(TaskStats.task_count)
+    stmt = select(
+        TaskStats.category,
+        total.label('total'),
+        func.sum(case((TaskStats.status == 'completed', TaskStats.task_count), else_=0)).label('completed')
+    )
+    if user_id:
+        stmt = stmt.filter(TaskStats.user_id == user_id)
+    return stmt.group_by(TaskStats.category).having(total > 0)
+
+
+def category_report(rows):
+    return {
+        'categories': [{
+            'name': category or None,
+            'total': total,
+            'completed': completed,
+            'completion_rate': (completed / total * 100) if total > 0 else 0
+        } for category, total, completed in rows]
+    }
+
+
+def time_tracking_statement(user_id):
+    """Totales y desgloses en una única consulta agrupada por usuario y categoría
+
+    ``actual_hours`` puede ser NULL: SUM() lo ignora y la precisión solo
+    compara las tareas que sí tienen horas reales registradas.
+    """
+    tracked_estimated = tracked_estimated_hours()
+    stmt = select(
+        Task.user_id,
+        User.username,
+        Task.category,
+        func.count(Task.id),
+        func.coalesce(func.sum(Task.estimated_hours), 0),
+        func.coalesce(func.sum(Task.actual_hours), 0),
+        func.coalesce(tracked_estimated, 0),
+        func.count(Task.actual_hours)
+    ).join(User, Task.user_id == User.id).filter(Task.completed_date.isnot(None))
+    if user_id:
+        stmt = stmt.filter(Task.user_id == user_id)
+    return stmt.group_by(Task.user_id, User.username, Task.category)
+
+
+def time_tracking_report(groups):
+    def empty():
+        return {'tasks': 0, 'estimated_hours': 0, 'actual_hours': 0, 'tracked_estimated': 0, 'tracked': 0}
+
+    totals = empty()
+    by_user, by_category = {}, {}
+    for uid, username, category, count, estimated, actual, tracked_estimated_hours, tracked in groups:
+        for bucket in (totals,
+                       by_user.setdefault((uid, username), empty()),
+                       by_category.setdefault(category, empty())):
+            bucket['tasks'] += count
+            bucket['estimated_hours'] += estimated
+            bucket['actual_hours'] += actual
+            bucket['tracked_estimated'] += tracked_estimated_hours
+            bucket['tracked'] += tracked
+
+    def summarize(bucket):
+        return {
+            'tasks': bucket['tasks'],
+            'estimated_hours': bucket['estimated_hours'],
+            'actual_hours': bucket['actual_hours'],
+            'accuracy_rate': accuracy_rate(bucket['tracked_estimated'], bucket['actual_hours'])
+        }
+
+    return {
+        'total_estimated_hours': totals['estimated_hours'],
+        'total_actual_hours': totals['actual_hours'],
+        'accuracy_rate': accuracy_rate(totals['tracked_estimated'], totals['actual_hours']),
+        'tasks_without_actual_hours': totals['tasks'] - totals['tracked'],
+        'by_user': [dict(summarize(bucket), user_id=uid, username=username)
+                    for (uid, username), bucket in by_user.items()],
+        'by_category': [dict(summarize(bucket), name=category)
+                        for category, bucket in by_category.items()]
+    }
+
+
+def time_tracking_detail_statement(args):
+    """Detalle por tarea paginado por (completed_date, id): ``(sentencia, campos, limit)``"""
+    fields = parse_fields(
+        args.get('fields'),
+        default=('title', 'estimated_hours', 'actual_hours', 'completed_date')
+    )
+    limit = parse_limit(args.get('limit'))
+    stmt = task_select(fields, extra=('id', 'completed_date')).filter(Task.completed_date.isnot(None))
+    if args.get('user_id'):
+        stmt = stmt.filter(Task.user_id == args.get('user_id'))
+    stmt = apply_keyset(stmt, 'completed_date', args.get('cursor'))
+    return stmt.limit(limit + 1), fields, limit
+
+
+def productivity_statements(args, dialect):
+    """Devuelve ``(start, end, granularity, sentencias)`` del reporte de productividad
+
+    Las sentencias agrupan las tareas completadas en la ventana por periodo,
+    por usuario y por categoría; el agrupado por periodo se hace en SQL. La
+    ventana no puede superar ``MAX_WINDOW_DAYS`` de la granularidad.
+    """
+    granularity = args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Invalid granularity, expected one of: {", ".join(GRANULARITIES)}')
+    start_date, end_date = parse_window(args)
+    if end_date - start_date > timedelta(days=MAX_WINDOW_DAYS[granularity]):
+        raise ValueError(f'Range too large for {granularity} granularity, '
+                         f'maximum is {MAX_WINDOW_DAYS[granularity]} days')
+
+    user_id = args.get('user_id')
+    hours = func.coalesce(func.sum(Task.actual_hours), 0)
+
+    def completed_in_window(*columns):
+        stmt = select(*columns).filter(Task.completed_date.between(start_date, end_date))
+        if user_id:
+            stmt = stmt.filter(Task.user_id == user_id)
+        return stmt
+
+    bucket = bucket_expression(Task.completed_date, granularity, dialect)
+    statements = (
+        completed_in_window(bucket, func.count(Task.id), hours).group_by(bucket),
+        completed_in_window(Task.user_id, User.username, func.count(Task.id), hours).join(
+            User, Task.user_id == User.id
+        ).group_by(Task.user_id, User.username),
+        completed_in_window(Task.category, func.count(Task.id), hours).group_by(Task.category),
+    )
+    return start_date, end_date, granularity, statements
+
+
+def productivity_report(start_date, end_date, granularity, bucket_rows, user_rows, category_rows):
+    # Python solo rellena los periodos sin tareas completadas
+    buckets = zero_fill(bucket_rows, start_date, end_date, granularity)
+    report = {
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'granularity': granularity,
+        'total_completed': sum(item['completed'] for item in buckets),
+        'total_hours': sum(item['hours'] for item in buckets),
+        'by_period': buckets,
+        'by_user': [{
+            'user_id': uid,
+            'username': username,
+            'completed': completed,
+            'hours': total_hours
+        } for uid, username, completed, total_hours in user_rows],
+        'by_category': [{
+            'name': category,
+            'completed': completed,
+            'hours': total_hours
+        } for category, completed, total_hours in category_rows]
+    }
+    # Compatibilidad con clientes que leen el desglose diario
+    if granularity == 'day':
+        report['by_day'] = buckets
+    return report
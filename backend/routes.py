@@ -1,48 +0,0 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime
-from models import db, Task
-
-# Crear un Blueprint para las rutas de la API
-api = Blueprint('api', __name__)
-
-# Rutas de la API
-@api.route('/tasks', methods=['GET'])
-def get_tasks():
-    tasks = Task.query.all()
-    return jsonify([task.to_dict() for task in tasks])
-
-@api.route('/tasks', methods=['POST'])
-def create_task():
-    data = request.json
-    new_task = Task(
-        title=data['title'],
-        description=data.get('description', ''),
-        due_date=datetime.fromisoformat(data['due_date']) if data.get('due_date') else None,
-        status=data.get('status', 'pending'),
-        priority=data.get('priority', 'medium')
-    )
-    db.session.add(new_task)
-    db.session.commit()
-    return jsonify(new_task.to_dict()), 201
-
-@api.route('/tasks/<int:task_id>', methods=['PUT'])
-def update_task(task_id):
-    task = Task.query.get_or_404(task_id)
-    data = request.json
-    
-    task.title = data.get('title', task.title)
-    task.description = data.get('description', task.description)
-    if data.get('due_date'):
-        task.due_date = datetime.fromisoformat(data['due_date'])
-    task.status = data.get('status', task.status)
-    task.priority = data.get('priority', task.priority)
-    
-    db.session.commit()
-    return jsonify(task.to_dict())
-
-@api.route('/tasks/<int:task_id>', methods=['DELETE'])
-def delete_task(task_id):
-    task = Task.query.get_or_404(task_id)
-    db.session.delete(task)
-    db.session.commit()
-    return '', 204 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from routes.frontend import frontend_bp
+from routes.auth import auth_bp
+from routes.tasks import tasks_bp
+from routes.calendar import calendar_bp
+from routes.reports import reports_bp
+from routes.tags import tags_bp
+from routes.search import search_bp
+from routes.sync import sync_bp
+from routes.stream import stream_bp
+from routes.cache import cache_bp
+from routes.metrics import metrics_bp
+from routes.export import export_bp
+
+BLUEPRINTS = (auth_bp, search_bp, sync_bp, stream_bp, cache_bp, metrics_bp, export_bp, tasks_bp, tags_bp, calendar_bp, reports_bp, frontend_bp)
+
+
+def register_blueprints(app):
+    """Registra todos los blueprints de la aplicación"""
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
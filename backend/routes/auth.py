@@ -0,0 +1,52 @@
+from flask import Blueprint, request
+from models import db, User
+from passwords import PasswordPoolBusy, password_hasher
+
+# Rutas de autenticación
+auth_bp = Blueprint('auth', __name__, url_prefix='/api')
+
+@auth_bp.errorhandler(PasswordPoolBusy)
+def password_pool_busy(e):
+    # Rechazo inmediato: el cliente reintenta en lugar de ocupar un worker
+    return {'error': str(e)}, 503, {'Retry-After': '1'}
+
+@auth_bp.route('/auth/register', methods=['POST'])
+def register():
+    data = request.json
+    
+    # Verificar si el usuario ya existe
+    if User.query.filter_by(email=data['email']).first():
+        return {'error': 'Email already registered'}, 400
+    if User.query.filter_by(username=data['username']).first():
+        return {'error': 'Username already taken'}, 400
+    
+    # Crear nuevo usuario
+    user = User(
+        email=data['email'],
+        username=data['username']
+    )
+    user.set_password(data['password'])
+    
+    db.session.add(user)
+    db.session.commit()
+    
+    return user.to_dict(), 201
+
+@auth_bp.route('/auth/login', methods=['POST'])
+def login():
+    data = request.json
+    
+    # Buscar usuario por email
+    user = User.query.filter_by(email=data['email']).first()
+    
+    if user and user.check_password(data['password']):
+        # Regenerar el hash si se cambiaron los parámetros configurados
+        if password_hasher().needs_rehash(user.password_hash):
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+            except PasswordPoolBusy:
+                pass
+        return user.to_dict()
+    
+    return {'error': 'Invalid credentials'}, 401
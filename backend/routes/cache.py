@@ -0,0 +1,12 @@
+from flask import Blueprint
+from cache import response_cache
+
+# Rutas de la caché de respuestas
+cache_bp = Blueprint('cache', __name__, url_prefix='/api')
+
+@cache_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    cache = response_cache()
+    if cache is None:
+        return {'backend': 'none'}
+    return cache.stats()
@@ -0,0 +1,32 @@
+from flask import Blueprint, request
+from models import db
+from serializers import row_to_dict
+from queries import calendar_statement, calendar_summary_statement, calendar_summary
+from etag import conditional
+from cache import cached
+
+# Rutas para el calendario
+calendar_bp = Blueprint('calendar', __name__, url_prefix='/api')
+
+@calendar_bp.route('/calendar/tasks', methods=['GET'])
+@conditional()
+@cached()
+def get_calendar_tasks():
+    try:
+        stmt, fields = calendar_statement(request.args)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    return {'tasks': [row_to_dict(row, fields) for row in db.session.execute(stmt)]}
+
+
+@calendar_bp.route('/calendar/summary', methods=['GET'])
+@conditional()
+@cached()
+def get_calendar_summary():
+    try:
+        start, end, stmt = calendar_summary_statement(request.args, db.engine.dialect.name)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    return calendar_summary(start, end, db.session.execute(stmt))
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, Response, stream_with_context
+from models import db
+from queries import export_statement
+from export import EXPORT_CHUNK_SIZE, export_writer, export_headers, export_chunks
+from etag import conditional
+
+# Exportación de tareas a ficheros
+export_bp = Blueprint('export', __name__, url_prefix='/api')
+
+@export_bp.route('/export/tasks', methods=['GET'])
+@conditional()
+def export_tasks():
+    try:
+        stmt, fields = export_statement(request.args)
+        writer = export_writer(request.args.get('format', 'csv'), fields)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    # Se lee desde un cursor del servidor por bloques: la memoria del worker
+    # no depende del número de tareas exportadas
+    def generate():
+        result = db.session.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        yield from export_chunks(writer, result.partitions())
+
+    return Response(stream_with_context(generate()), content_type=writer.content_type,
+                    headers=export_headers(writer))
@@ -0,0 +1,19 @@
+from flask import Blueprint, current_app, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from assets import build_dir, send_asset
+
+# Rutas para servir archivos estáticos
+frontend_bp = Blueprint('frontend', __name__)
+
+@frontend_bp.route('/')
+def index():
+    return serve_static('index.html')
+
+@frontend_bp.route('/<path:path>')
+def serve_static(path):
+    # Los recursos generados con "flask build-assets" (frontend/dist) tienen
+    # prioridad; sin build se sirven los ficheros fuente tal cual
+    try:
+        return send_asset(build_dir(current_app.static_folder), path, request.accept_encodings)
+    except NotFound:
+        return send_from_directory(current_app.static_folder, path)
@@ -0,0 +1,39 @@
+from flask import Blueprint, Response, abort
+from cache import response_cache
+from metrics import request_metrics
+
+# Métricas en formato Prometheus, fuera de /api como es habitual
+metrics_bp = Blueprint('metrics', __name__)
+
+# Contadores de la caché de respuestas que se exportan y su tipo
+CACHE_METRICS = {
+    'hits': 'counter',
+    'misses': 'counter',
+    'evictions': 'counter',
+    'expirations': 'counter',
+    'entries': 'gauge',
+    'bytes': 'gauge'
+}
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    metrics = request_metrics()
+    if metrics is None:
+        abort(404)
+
+    extra = []
+    cache = response_cache()
+    if cache is not None:
+        for name, value in cache.stats().items():
+            if name in CACHE_METRICS:
+                suffix = '_total' if CACHE_METRICS[name] == 'counter' else ''
+                extra.append((f'response_cache_{name}{suffix}', CACHE_METRICS[name],
+                              f'Caché de respuestas: {name}', value))
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+@metrics_bp.route('/metrics/slow-queries', methods=['GET'])
+def get_slow_queries():
+    metrics = request_metrics()
+    if metrics is None:
+        abort(404)
+    return {'threshold_ms': metrics.slow_query_seconds * 1000, 'queries': metrics.slow_query_log()}
@@ -0,0 +1,75 @@
+from flask import Blueprint, request
+from models import db
+from queries import task_page
+from reports import (
+    summary_statements, summary_report, category_statement, category_report,
+    time_tracking_statement, time_tracking_report, time_tracking_detail_statement,
+    productivity_statements, productivity_report
+)
+from analytics import parse_days, analytics_statements, analytics_frames, analytics_report
+from etag import conditional
+from cache import cached
+
+# Rutas para reportes
+reports_bp = Blueprint('reports', __name__, url_prefix='/api')
+
+@reports_bp.route('/reports/summary', methods=['GET'])
+@conditional(time_dependent=True)
+@cached(time_dependent=True)
+def get_summary_report():
+    # Los conteos por estado salen de la tabla materializada task_stats
+    by_status, overdue = summary_statements(request.args.get('user_id'))
+    return summary_report(db.session.execute(by_status).all(), db.session.execute(overdue).scalar())
+
+@reports_bp.route('/reports/by-category', methods=['GET'])
+@conditional()
+@cached()
+def get_category_report():
+    return category_report(db.session.execute(category_statement(request.args.get('user_id'))).all())
+
+@reports_bp.route('/reports/time-tracking', methods=['GET'])
+@conditional()
+@cached()
+def get_time_tracking_report():
+    groups = db.session.execute(time_tracking_statement(request.args.get('user_id'))).all()
+    report = time_tracking_report(groups)
+
+    # El detalle por tarea es opcional y se pagina por (completed_date, id)
+    if request.args.get('details', '1') in ('0', 'false'):
+        return report
+
+    try:
+        stmt, fields, limit = time_tracking_detail_statement(request.args)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    report.update(task_page(db.session.execute(stmt).all(), fields, 'completed_date', limit))
+    return report
+
+@reports_bp.route('/reports/productivity', methods=['GET'])
+@conditional(time_dependent=True)
+@cached(time_dependent=True)
+def get_productivity_report():
+    try:
+        start_date, end_date, granularity, statements = productivity_statements(
+            request.args, db.engine.dialect.name
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    rows = [db.session.execute(stmt).all() for stmt in statements]
+    return productivity_report(start_date, end_date, granularity, *rows)
+
+@reports_bp.route('/reports/analytics', methods=['GET'])
+@conditional(time_dependent=True)
+@cached(time_dependent=True)
+def get_analytics_report():
+    # Un número fijo de consultas agrupadas, sea cual sea el número de usuarios
+    try:
+        days = parse_days(request.args.get('days'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    start, end, statements = analytics_statements(request.args.get('user_id'), days, db.engine.dialect.name)
+    results = {name: db.session.execute(stmt).all() for name, stmt in statements.items()}
+    return analytics_report(analytics_frames(start, end, results))
@@ -0,0 +1,41 @@
+from flask import Blueprint, request
+from models import db
+from pagination import parse_limit
+from search import build_match_query, search_tasks
+
+# Rutas de búsqueda de texto completo
+search_bp = Blueprint('search', __name__, url_prefix='/api')
+
+@search_bp.route('/tasks/search', methods=['GET'])
+def search():
+    if db.engine.dialect.name != 'sqlite':
+        return {'error': 'Full-text search requires SQLite FTS5'}, 501
+
+    match = build_match_query(request.args.get('q'), prefix=request.args.get('prefix', '1') != '0')
+    if not match:
+        return {'error': 'Missing search query'}, 400
+
+    try:
+        limit = parse_limit(request.args.get('limit', 20))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return {'error': 'Invalid limit or offset'}, 400
+
+    # Se pide un resultado extra para saber si hay más páginas
+    rows = search_tasks(match, request.args.get('user_id'), limit + 1, offset)
+
+    return {
+        'results': [{
+            'id': row['id'],
+            'title': row['title'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'category': row['category'],
+            'due_date': row['due_date'].isoformat() if row['due_date'] else None,
+            'user_id': row['user_id'],
+            'title_highlight': row['title_highlight'],
+            'snippet': row['snippet'],
+            'rank': row['rank']
+        } for row in rows[:limit]],
+        'next_offset': offset + limit if len(rows) > limit else None
+    }
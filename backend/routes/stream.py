@@ -0,0 +1,24 @@
+from flask import Blueprint, Response, request
+from events import hub, stream_events
+
+# Canal de eventos en tiempo real (Server-Sent Events)
+stream_bp = Blueprint('stream', __name__, url_prefix='/api')
+
+@stream_bp.route('/stream', methods=['GET'])
+def stream():
+    try:
+        user_id = int(request.args['user_id']) if request.args.get('user_id') else None
+    except ValueError:
+        return {'error': 'Invalid user_id'}, 400
+
+    # El navegador envía Last-Event-ID al reconectar; el parámetro permite
+    # reanudar también en la primera conexión de una pestaña nueva
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    # Sin stream_with_context: la conexión no retiene el contexto de la
+    # petición ni una sesión de base de datos mientras está abierta
+    return Response(
+        stream_events(hub, user_id, last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
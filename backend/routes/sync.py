@@ -0,0 +1,33 @@
+from flask import Blueprint, request
+from pagination import parse_limit
+from serializers import parse_fields, task_projection, row_to_dict
+from versions import changes_since, parse_sync_cursor
+
+# Rutas de sincronización incremental
+sync_bp = Blueprint('sync', __name__, url_prefix='/api')
+
+@sync_bp.route('/tasks/changes', methods=['GET'])
+def get_task_changes():
+    try:
+        # Sin "since" se devuelven todas las tareas (sincronización inicial)
+        cursor = parse_sync_cursor(request.args.get('since'))
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    query = task_projection(fields, extra=('id',))
+    try:
+        rows, deleted_ids, cursor, has_more = changes_since(
+            query, cursor, request.args.get('user_id'), limit
+        )
+    except LookupError as e:
+        # El cliente debe descartar su copia local y volver a empezar sin "since"
+        return {'error': str(e)}, 410
+
+    return {
+        'changes': [row_to_dict(row, fields) for row in rows],
+        'deleted': deleted_ids,
+        'cursor': cursor,
+        'has_more': has_more
+    }
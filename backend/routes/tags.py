@@ -0,0 +1,14 @@
+from flask import Blueprint, request
+from tags import tag_counts
+from etag import conditional
+
+# Rutas de etiquetas
+tags_bp = Blueprint('tags', __name__, url_prefix='/api')
+
+@tags_bp.route('/tags', methods=['GET'])
+@conditional()
+def get_tags():
+    user_id = request.args.get('user_id')
+    return {
+        'tags': [{'name': name, 'count': count} for name, count in tag_counts(user_id)]
+    }
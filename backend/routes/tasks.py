@@ -0,0 +1,107 @@
+from flask import Blueprint, request, Response, stream_with_context
+from sqlalchemy.orm import joinedload
+from models import db, Task, User
+from pagination import STREAM_CHUNK_SIZE
+from serializers import row_to_dict
+from queries import task_list_statement, task_page
+from bulk import MAX_OPERATIONS, apply_bulk
+from etag import conditional
+from cache import cached
+from events import hub
+import json
+
+# Rutas de la API de tareas
+tasks_bp = Blueprint('tasks', __name__, url_prefix='/api')
+
+@tasks_bp.route('/tasks', methods=['GET'])
+@conditional()
+@cached()
+def get_tasks():
+    stream = request.args.get('format') == 'ndjson'
+    try:
+        stmt, fields, sort, limit = task_list_statement(request.args, stream=stream)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    # Modo streaming: NDJSON leído desde un cursor del servidor por bloques
+    if stream:
+        def generate():
+            rows = db.session.execute(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE))
+            for row in rows:
+                yield json.dumps(row_to_dict(row, fields)) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    return task_page(db.session.execute(stmt).all(), fields, sort, limit)
+
+@tasks_bp.route('/tasks', methods=['POST'])
+def create_task():
+    data = request.json
+    
+    # Verificar que el usuario existe
+    user = User.query.get_or_404(data['user_id'])
+    
+    task = Task.from_payload(data, user.id)
+    db.session.add(task)
+    db.session.commit()
+    task_dict = task.to_dict()
+    hub.publish('created', task.id, task.user_id, task_dict)
+    return task_dict
+
+@tasks_bp.route('/tasks/bulk', methods=['POST'])
+def bulk_tasks():
+    data = request.json or {}
+    operations = data.get('operations')
+
+    if not isinstance(operations, list) or not operations:
+        return {'error': 'operations must be a non-empty list'}, 400
+    if len(operations) > MAX_OPERATIONS:
+        return {'error': f'At most {MAX_OPERATIONS} operations per batch'}, 413
+    if not all(isinstance(op, dict) for op in operations):
+        return {'error': 'Each operation must be an object'}, 400
+
+    results, applied = apply_bulk(operations, atomic=bool(data.get('atomic')))
+    failed = sum(1 for result in results if result['status'] >= 400)
+    if applied:
+        _publish_bulk(results)
+
+    # 207 indica que parte de las operaciones falló y el resto se aplicó
+    if not applied:
+        status = 400
+    elif failed:
+        status = 207
+    else:
+        status = 200
+    return {'applied': applied, 'failed': failed, 'results': results}, status
+
+def _publish_bulk(results):
+    """Publica los eventos de las operaciones aplicadas de un lote"""
+    applied = [result for result in results if result['status'] < 400]
+    changed_ids = [result['id'] for result in applied if result['op'] != 'delete']
+    tasks = {task.id: task.to_dict() for task in Task.query.options(
+        joinedload(Task.user)
+    ).filter(Task.id.in_(changed_ids))} if changed_ids else {}
+
+    for result in applied:
+        event = {'create': 'created', 'update': 'updated', 'delete': 'deleted'}[result['op']]
+        hub.publish(event, result['id'], result['user_id'], tasks.get(result['id']))
+
+@tasks_bp.route('/tasks/<int:task_id>', methods=['PUT'])
+def update_task(task_id):
+    task = Task.query.get_or_404(task_id)
+    data = request.json
+    
+    task.apply_payload(data)
+    db.session.commit()
+    task_dict = task.to_dict()
+    hub.publish('updated', task.id, task.user_id, task_dict)
+    return task_dict
+
+@tasks_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
+def delete_task(task_id):
+    task = Task.query.get_or_404(task_id)
+    user_id = task.user_id
+    db.session.delete(task)
+    db.session.commit()
+    hub.publish('deleted', task_id, user_id, None)
+    return {'message': 'Task deleted successfully'}
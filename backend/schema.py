@@ -0,0 +1,64 @@
+import os
+
+from models import db
+
+# Alembic (y Flask-Migrate, que lo importa) tarda más en importarse que el
+# resto de la aplicación, así que solo se carga cuando hace falta.
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+def init_migrations(app):
+    """Registra Flask-Migrate para los comandos ``flask db`` y ``stamp()``"""
+    from flask_migrate import Migrate
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+
+
+def migration_heads(directory=MIGRATIONS_DIR):
+    """Revisiones finales definidas en el directorio de migraciones"""
+    from alembic.config import Config as AlembicConfig
+    from alembic.script import ScriptDirectory
+
+    config = AlembicConfig()
+    config.set_main_option('script_location', directory)
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def current_revisions(engine):
+    """Revisiones aplicadas en la base de datos (tabla alembic_version)"""
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def schema_status():
+    """Devuelve un mensaje de error si la base de datos no está en la última migración"""
+    heads = migration_heads()
+    current = current_revisions(db.engine)
+    if current != heads:
+        return (f"Database schema at {sorted(current) or 'no revision'}, "
+                f"expected {sorted(heads)}. Run 'flask db upgrade'.")
+    return None
+
+
+def init_schema_check(app):
+    """Comprueba la revisión del esquema una sola vez, en la primera petición
+
+    ``SCHEMA_CHECK`` controla el comportamiento: ``warn`` registra un aviso,
+    ``error`` responde 503 a todas las peticiones y ``off`` no comprueba nada.
+    """
+    mode = app.config.get('SCHEMA_CHECK', 'warn')
+    if mode == 'off':
+        return
+
+    state = {'checked': False, 'error': None}
+
+    @app.before_request
+    def _check_schema_once():
+        if not state['checked']:
+            state['checked'] = True
+            state['error'] = schema_status()
+            if state['error']:
+                app.logger.warning(state['error'])
+        if state['error'] and mode == 'error':
+            return {'error': state['error']}, 503
@@ -0,0 +1,120 @@
+import html
+import re
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, DateTime, event, text
+
+from models import db, Task
+
+# Índice FTS5 de contenido externo: guarda solo el índice invertido y lee
+# el texto de la tabla task. Los triggers lo mantienen sincronizado.
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        title, description, tags,
+        content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description, tags ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+        INSERT INTO task_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""",
+]
+
+FTS_DROP_DDL = [
+    'DROP TRIGGER IF EXISTS task_fts_au',
+    'DROP TRIGGER IF EXISTS task_fts_ad',
+    'DROP TRIGGER IF EXISTS task_fts_ai',
+    'DROP TABLE IF EXISTS task_fts',
+]
+
+# db.create_all()/drop_all() (pruebas y scripts de datos) también gestionan
+# el índice; en producción lo crea la migración correspondiente.
+for statement in FTS_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in FTS_DROP_DDL:
+    event.listen(Task.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+
+# Peso de cada columna en bm25 (la descripción pesa 1): una coincidencia en
+# el título o en las etiquetas es más relevante que en la descripción
+TITLE_WEIGHT = 10.0
+TAGS_WEIGHT = 5.0
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Marcas de uso privado para las coincidencias: el texto de la tarea se
+# escapa como HTML antes de sustituirlas por <mark>
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+
+def build_match_query(q, prefix=True):
+    """Convierte el texto del usuario en una expresión MATCH segura
+
+    Cada palabra se escapa entre comillas para que la sintaxis de FTS5 del
+    usuario no se interprete; con ``prefix`` la última palabra busca por
+    prefijo, de modo que "docu" encuentra "documentación".
+    """
+    tokens = _TOKEN.findall(q or '')
+    if not tokens:
+        return None
+    terms = ['"{}"'.format(token.replace('"', '""')) for token in tokens]
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_tasks(match, user_id=None, limit=20, offset=0):
+    """Busca tareas ordenadas por relevancia (bm25) con fragmentos resaltados"""
+    sql = """
+        SELECT task.id, task.title, task.status, task.priority, task.due_date,
+               task.category, task.user_id,
+               highlight(task_fts, 0, :mark_start, :mark_end) AS title_highlight,
+               snippet(task_fts, -1, :mark_start, :mark_end, '…', 12) AS snippet,
+               bm25(task_fts, :title_weight, 1.0, :tags_weight) AS rank
+        FROM task_fts
+        JOIN task ON task.id = task_fts.rowid
+        WHERE task_fts MATCH :match
+    """
+    params = {'match': match, 'limit': limit, 'offset': offset,
+              'title_weight': TITLE_WEIGHT, 'tags_weight': TAGS_WEIGHT,
+              'mark_start': MARK_START, 'mark_end': MARK_END}
+    if user_id:
+        sql += ' AND task.user_id = :user_id'
+        params['user_id'] = user_id
+    sql += ' ORDER BY rank LIMIT :limit OFFSET :offset'
+    rows = db.session.execute(text(sql).columns(due_date=DateTime), params).mappings().all()
+    return [dict(row, title_highlight=mark_matches(row['title_highlight']), snippet=mark_matches(row['snippet']))
+            for row in rows]
+
+
+def mark_matches(value):
+    """Escapa el texto como HTML y convierte las marcas de FTS5 en <mark>"""
+    if value is None:
+        return None
+    return html.escape(value).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def rebuild_search_index():
+    """Reconstruye el índice FTS completo a partir de la tabla task"""
+    db.session.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+    db.session.commit()
+
+
+@click.command('rebuild-search')
+@with_appcontext
+def rebuild_search_command():
+    """Reconstruye el índice de búsqueda de texto completo"""
+    rebuild_search_index()
+    print("Índice task_fts reconstruido")
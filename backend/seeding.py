@@ -0,0 +1,281 @@
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, text
+
+from models import db, User, Task, Tag, task_tag
+from passwords import PasswordHasher
+from search import FTS_DDL, FTS_DROP_DDL, rebuild_search_index
+from stats import rebuild_task_stats
+from versions import bump_versions
+
+DEFAULT_STATUS_MIX = 'pending=35,in_progress=25,completed=40'
+PRIORITIES = ('low', 'medium', 'high')
+PRIORITY_WEIGHTS = (30, 50, 20)
+CATEGORIES = ('Desarrollo', 'Diseño', 'Marketing', 'Pruebas', 'Documentación', 'Soporte')
+# Primeras etiquetas del catálogo; si se piden más se numeran (tag-51, tag-52...)
+BASE_TAGS = (
+    'urgente', 'bug', 'feature', 'mejora', 'frontend', 'backend', 'api', 'ui', 'ux',
+    'testing', 'documentación', 'reunión', 'database', 'security', 'seo', 'mobile'
+)
+SEED_PASSWORD = 'password123'
+SEED_CHUNK_SIZE = 50000
+
+
+def parse_status_mix(value):
+    """Convierte ``pending=35,completed=65`` en ``((estado, peso), ...)``
+
+    Lanza ``ValueError`` si el formato o los pesos no son válidos.
+    """
+    mix = []
+    for part in value.split(','):
+        status, _, weight = part.partition('=')
+        status = status.strip()
+        if status not in ('pending', 'in_progress', 'completed') or not weight:
+            raise ValueError(f'Invalid status mix entry: {part!r}')
+        if float(weight) < 0:
+            raise ValueError(f'Negative weight for {status}')
+        mix.append((status, float(weight)))
+    if not sum(weight for _, weight in mix):
+        raise ValueError('Status mix weights must not all be zero')
+    return tuple(mix)
+
+
+def tag_names(count):
+    return [BASE_TAGS[i] if i < len(BASE_TAGS) else f'tag-{i + 1}' for i in range(count)]
+
+
+def generate_chunk(params, chunk_index, first_id, count):
+    """Genera las filas de ``task`` y ``task_tag`` de los ids ``first_id..first_id+count-1``
+
+    Cada bloque tiene su propio generador derivado de la semilla y del
+    índice del bloque, así que el resultado no depende del número de
+    procesos que generan. Las etiquetas siguen una distribución de Zipf:
+    unas pocas aparecen en muchas tareas.
+    """
+    rng = random.Random(f"{params['seed']}:{chunk_index}")
+    reference = params['reference']
+    statuses, status_weights = zip(*params['status_mix'])
+    status_cum = list(accumulate(status_weights))
+    priority_cum = list(accumulate(PRIORITY_WEIGHTS))
+    tag_ids = range(1, params['tag_count'] + 1)
+    tag_cum = list(accumulate(1 / rank for rank in tag_ids))
+    users, overdue_ratio, max_tags = params['users'], params['overdue_ratio'], params['max_tags']
+    change_seq = params['change_seq']
+    names = tag_names(params['tag_count'])
+
+    tasks, tags = [], []
+    for task_id in range(first_id, first_id + count):
+        status = rng.choices(statuses, cum_weights=status_cum)[0]
+        category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+        created_at = reference - timedelta(days=rng.randint(1, 365), seconds=rng.randrange(86400))
+        estimated = float(rng.randint(1, 16))
+
+        if status == 'completed':
+            completed_date = min(created_at + timedelta(days=rng.randint(0, 30), seconds=rng.randrange(86400)),
+                                 reference)
+            due_date = completed_date + timedelta(days=rng.randint(-3, 5))
+            actual = max(0.5, round(estimated + rng.uniform(-2, 4), 1))
+            updated_at = completed_date
+        else:
+            completed_date = None
+            if rng.random() < overdue_ratio:
+                due_date = reference - timedelta(days=rng.randint(1, 30))
+            else:
+                due_date = reference + timedelta(days=rng.randint(0, 60))
+            actual = round(estimated * rng.uniform(0.1, 0.9), 1) if status == 'in_progress' else 0.0
+            updated_at = created_at + timedelta(days=rng.randint(0, 3))
+
+        chosen = sorted(set(rng.choices(tag_ids, cum_weights=tag_cum, k=rng.randint(0, max_tags)))) \
+            if max_tags else []
+        tasks.append({
+            'id': task_id,
+            'title': f'Tarea {task_id} de {category}',
+            'description': f'Tarea de prueba {task_id} ({category.lower()})',
+            'status': status,
+            'priority': rng.choices(PRIORITIES, cum_weights=priority_cum)[0],
+            'due_date': due_date.replace(microsecond=0),
+            'completed_date': completed_date,
+            'estimated_hours': estimated,
+            'actual_hours': actual,
+            'category': category,
+            'tags': ','.join(names[tag_id - 1] for tag_id in chosen) or None,
+            'created_at': created_at,
+            'updated_at': min(updated_at, reference),
+            'user_id': rng.randint(1, users),
+            'change_seq': change_seq
+        })
+        tags.extend({'task_id': task_id, 'tag_id': tag_id} for tag_id in chosen)
+    return tasks, tags
+
+
+def _generate(args):
+    return generate_chunk(*args)
+
+
+def _chunks(total, chunk_size):
+    for index, offset in enumerate(range(0, total, chunk_size)):
+        yield index, offset + 1, min(chunk_size, total - offset)
+
+
+def _insert_many(connection, table, rows):
+    """``executemany`` sobre el cursor del driver, sin el procesado fila a fila de SQLAlchemy
+
+    Los valores se convierten con los procesadores de tipo del dialecto
+    (fechas en SQLite...). Con drivers de parámetros con nombre se usa el
+    ``insert()`` normal.
+    """
+    if not rows:
+        return
+    compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(rows[0]))
+    if not compiled.positional:
+        connection.execute(table.insert(), rows)
+        return
+    names = compiled.positiontup
+    processors = [table.c[name].type.bind_processor(connection.dialect) for name in names]
+    converters = list(zip(names, processors))
+    connection.exec_driver_sql(str(compiled), [
+        tuple(process(row[name]) if process else row[name] for name, process in converters)
+        for row in rows
+    ])
+
+
+def _bulk_indexes():
+    """Índices secundarios que se crean después de la carga en lugar de mantenerse fila a fila"""
+    return list(Task.__table__.indexes) + list(task_tag.indexes)
+
+
+def seed_database(seed=42, users=10, tasks=1000, status_mix=DEFAULT_STATUS_MIX, overdue_ratio=0.15,
+                  tag_count=50, max_tags=3, chunk_size=SEED_CHUNK_SIZE, workers=1, reference=None,
+                  progress=None):
+    """Vacía la base de datos y la llena con datos de prueba reproducibles
+
+    Los usuarios ``user1..userN`` (contraseña ``SEED_PASSWORD``) y las tareas
+    se insertan con ``executemany`` por bloques de ``chunk_size`` filas, un
+    bloque por transacción, sin pasar por el ORM. Por eso se mantienen aquí
+    las tablas que normalmente actualizan los listeners: ``task_tag`` se
+    genera junto con las tareas, ``task_stats`` y el índice FTS se
+    reconstruyen al final y todas las tareas llevan el ``change_seq`` de una
+    única versión de datos. Con ``workers > 1`` los bloques se generan en
+    varios procesos mientras el principal inserta.
+
+    Las fechas son relativas a ``reference`` (hoy a medianoche por defecto):
+    con la misma semilla, los mismos parámetros y la misma referencia el
+    resultado es idéntico.
+    """
+    reference = reference or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    status_mix = parse_status_mix(status_mix) if isinstance(status_mix, str) else status_mix
+    if not 0 <= overdue_ratio <= 1:
+        raise ValueError('overdue_ratio must be between 0 and 1')
+    if users < 1 or tasks < 0 or tag_count < 1 or chunk_size < 1:
+        raise ValueError('users, tag_count and chunk_size must be positive and tasks not negative')
+    progress = progress or (lambda message: None)
+    started = time.perf_counter()
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    engine = db.engine
+    sqlite = engine.dialect.name == 'sqlite'
+
+    with engine.begin() as connection:
+        for index in _bulk_indexes():
+            index.drop(connection)
+        if sqlite:
+            # Solo los triggers: la tabla task_fts se reconstruye al final
+            for statement in FTS_DROP_DDL[:-1]:
+                connection.execute(DDL(statement))
+
+        password_hash = PasswordHasher(current_app.config['PASSWORD_HASH_METHOD'], workers=0).hash(SEED_PASSWORD)
+        connection.execute(User.__table__.insert(), [
+            {'id': n, 'username': f'user{n}', 'email': f'user{n}@example.com', 'password_hash': password_hash}
+            for n in range(1, users + 1)
+        ])
+        connection.execute(Tag.__table__.insert(), [
+            {'id': i + 1, 'name': name} for i, name in enumerate(tag_names(tag_count))
+        ])
+        change_seq = bump_versions(connection, range(1, users + 1))
+
+    params = {
+        'seed': seed, 'users': users, 'status_mix': status_mix, 'overdue_ratio': overdue_ratio,
+        'tag_count': tag_count, 'max_tags': max_tags, 'reference': reference, 'change_seq': change_seq
+    }
+    jobs = ((params, *chunk) for chunk in _chunks(tasks, chunk_size))
+
+    pool = None
+    if workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        generated = pool.imap(_generate, jobs)
+    else:
+        generated = map(_generate, jobs)
+
+    inserted = 0
+    try:
+        for task_rows, tag_rows in generated:
+            with engine.begin() as connection:
+                _insert_many(connection, Task.__table__, task_rows)
+                _insert_many(connection, task_tag, tag_rows)
+            inserted += len(task_rows)
+            progress(f'{inserted}/{tasks} tareas ({time.perf_counter() - started:.1f} s)')
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    progress('Creando índices...')
+    with engine.begin() as connection:
+        for index in _bulk_indexes():
+            index.create(connection)
+        if sqlite:
+            for statement in FTS_DDL[1:]:
+                connection.execute(DDL(statement))
+
+    progress('Reconstruyendo task_stats y el índice de búsqueda...')
+    rebuild_task_stats()
+    if sqlite:
+        rebuild_search_index()
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+    return {'users': users, 'tasks': inserted, 'seconds': time.perf_counter() - started}
+
+
+@click.command('seed')
+@click.option('--seed', 'seed_value', default=42, show_default=True, help='Semilla del generador')
+@click.option('--users', default=10, show_default=True, help='Número de usuarios')
+@click.option('--tasks', default=1000, show_default=True, help='Número de tareas')
+@click.option('--status-mix', default=DEFAULT_STATUS_MIX, show_default=True,
+              help='Pesos de cada estado, p. ej. pending=1,completed=3')
+@click.option('--overdue-ratio', default=0.15, show_default=True,
+              help='Fracción de tareas no completadas con vencimiento pasado')
+@click.option('--tag-count', default=50, show_default=True, help='Etiquetas distintas')
+@click.option('--max-tags', default=3, show_default=True, help='Máximo de etiquetas por tarea')
+@click.option('--chunk-size', default=SEED_CHUNK_SIZE, show_default=True, help='Filas por transacción')
+@click.option('--workers', default=1, show_default=True, help='Procesos que generan filas')
+@click.option('--reference', default=None, help='Fecha de referencia (YYYY-MM-DD); por defecto hoy')
+@click.option('--yes', is_flag=True, help='No pedir confirmación antes de vaciar la base de datos')
+@with_appcontext
+def seed_command(seed_value, users, tasks, status_mix, overdue_ratio, tag_count, max_tags,
+                 chunk_size, workers, reference, yes):
+    """Vacía la base de datos y genera datos de prueba reproducibles"""
+    if not yes:
+        click.confirm('Se borrarán todos los datos de la base de datos. ¿Continuar?', abort=True)
+    try:
+        result = seed_database(
+            seed_value, users, tasks, status_mix, overdue_ratio, tag_count, max_tags, chunk_size,
+            workers, datetime.fromisoformat(reference) if reference else None, progress=print
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    # Marcar el esquema recién creado como actualizado a la última migración
+    from flask_migrate import stamp
+    stamp()
+    print(f"Datos generados: {result['users']} usuarios y {result['tasks']} tareas "
+          f"en {result['seconds']:.1f} s")
@@ -0,0 +1,106 @@
+from sqlalchemy import select
+
+from models import db, Task, User
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _split_tags(value):
+    return value.split(',') if value else []
+
+
+# Campos que se pueden pedir con ?fields=... y la columna SQL de la que salen
+TASK_FIELDS = {
+    'id': Task.id,
+    'title': Task.title,
+    'description': Task.description,
+    'status': Task.status,
+    'priority': Task.priority,
+    'due_date': Task.due_date,
+    'completed_date': Task.completed_date,
+    'estimated_hours': Task.estimated_hours,
+    'actual_hours': Task.actual_hours,
+    'category': Task.category,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at,
+    'tags': Task.tags,
+    'user_id': Task.user_id,
+    'username': User.username
+}
+
+_FORMATTERS = {
+    'due_date': _isoformat,
+    'completed_date': _isoformat,
+    'created_at': _isoformat,
+    'updated_at': _isoformat,
+    'tags': _split_tags
+}
+
+
+def parse_fields(value, default=None):
+    """Convierte ``?fields=a,b,c`` en una lista de campos válidos
+
+    Sin valor devuelve ``default`` o todos los campos. Lanza ``ValueError``
+    si se pide un campo desconocido.
+    """
+    if not value:
+        return list(default or TASK_FIELDS)
+
+    fields = []
+    for name in value.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in TASK_FIELDS:
+            raise ValueError(f'Unknown field: {name}')
+        if name not in fields:
+            fields.append(name)
+
+    if not fields:
+        raise ValueError('No fields requested')
+    return fields
+
+
+def _projection_columns(fields, extra):
+    names = list(dict.fromkeys(list(fields) + list(extra)))
+    return [TASK_FIELDS[name].label(name) for name in names], 'username' in names
+
+
+def task_projection(fields, extra=()):
+    """Construye una consulta que selecciona solo las columnas pedidas
+
+    ``extra`` añade columnas necesarias para la consulta (claves de
+    paginación, totales...) que no se devuelven al cliente. El nombre de
+    usuario se obtiene con un JOIN en la misma consulta, sin cargar la
+    relación ``Task.user`` fila a fila.
+    """
+    columns, with_user = _projection_columns(fields, extra)
+    query = db.session.query(*columns).select_from(Task)
+    if with_user:
+        query = query.join(User, Task.user_id == User.id)
+    return query
+
+
+def task_select(fields, extra=()):
+    """Igual que ``task_projection`` pero como ``select()``, sin depender de la sesión
+
+    Se ejecuta tanto con ``db.session`` como con una sesión asíncrona.
+    """
+    columns, with_user = _projection_columns(fields, extra)
+    stmt = select(*columns).select_from(Task)
+    if with_user:
+        stmt = stmt.join(User, Task.user_id == User.id)
+    return stmt
+
+
+def row_to_dict(row, fields):
+    """Construye el diccionario de salida directamente desde la tupla de la fila"""
+    mapping = row._mapping
+    result = {}
+    for name in fields:
+        value = mapping[name]
+        formatter = _FORMATTERS.get(name)
+        result[name] = formatter(value) if formatter else value
+    return result
@@ -0,0 +1,27 @@
+"""Servidor gevent para los clientes del canal de eventos (/api/stream)
+
+Cada conexión SSE abierta es una greenlet en lugar de un hilo, así que un
+solo proceso atiende miles de clientes inactivos. El hub de eventos vive en
+memoria del proceso: los cambios solo llegan a los clientes conectados al
+mismo proceso, por eso se usa un único worker.
+
+    python serve.py
+    gunicorn --worker-class gevent --workers 1 --worker-connections 5000 wsgi:app
+"""
+from gevent import monkey
+
+# Debe ejecutarse antes de importar la aplicación para que las colas y los
+# bloqueos del hub cedan el control a otras greenlets en lugar de bloquear
+monkey.patch_all()
+
+import os
+
+from gevent.pywsgi import WSGIServer
+
+from app import create_app
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    server = WSGIServer(('0.0.0.0', port), create_app())
+    print(f"Sirviendo en http://0.0.0.0:{port} (gevent)")
+    server.serve_forever()
@@ -0,0 +1,52 @@
+"""Mide el tiempo de arranque en frío de un worker
+
+Lanza varios intérpretes nuevos que importan la aplicación y llaman a
+``create_app()``, como haría cada worker de gunicorn al escalar.
+
+Uso:
+    python startup_benchmark.py [repeticiones]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CHILD = (
+    "import time; started = time.perf_counter();"
+    "from app import create_app; imported = time.perf_counter();"
+    "create_app(); created = time.perf_counter();"
+    "print((imported - started) * 1000, (created - imported) * 1000)"
+)
+
+
+def measure(runs=10):
+    """Devuelve los ms de importación, de ``create_app()`` y del proceso completo"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    import_ms, factory_ms, process_ms = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD],
+            cwd=backend_dir, capture_output=True, text=True, check=True
+        ).stdout
+        process_ms.append((time.perf_counter() - started) * 1000)
+        imported, created = output.strip().splitlines()[-1].split()
+        import_ms.append(float(imported))
+        factory_ms.append(float(created))
+    return import_ms, factory_ms, process_ms
+
+
+def report(name, values):
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    print(f"- {name}: mediana {statistics.median(values):.1f} ms, p95 {p95:.1f} ms, máx {values[-1]:.1f} ms")
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    import_ms, factory_ms, process_ms = measure(runs)
+    print(f"\n=== Arranque en frío ({runs} procesos) ===")
+    report('import de la aplicación', import_ms)
+    report('create_app()', factory_ms)
+    report('proceso completo', process_ms)
@@ -0,0 +1,129 @@
+from collections import Counter
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event, func, inspect, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import db, Task, TaskStats
+
+STATS_KEY = ('user_id', 'status', 'category', 'priority')
+# Valores que toma la tarea si la columna no se asignó antes del INSERT
+_DEFAULTS = {'status': 'pending', 'priority': 'medium', 'category': 'general'}
+
+
+def _normalize(name, value):
+    if name == 'user_id':
+        return value
+    return value if value is not None else ''
+
+
+def stats_key(values):
+    """Clave de ``task_stats`` para un diccionario con los valores de una tarea"""
+    return tuple(_normalize(name, values.get(name)) for name in STATS_KEY)
+
+
+def _current_key(task):
+    return stats_key({
+        name: getattr(task, name) if getattr(task, name) is not None else _DEFAULTS.get(name)
+        for name in STATS_KEY
+    })
+
+
+def _original_key(task):
+    state = inspect(task)
+    values = {}
+    for name in STATS_KEY:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else getattr(task, name)
+    return stats_key(values)
+
+
+def apply_stats_deltas(connection, deltas):
+    """Suma los incrementos ``{clave: delta}`` sobre ``task_stats``
+
+    Usa un UPSERT cuando el dialecto lo permite y, si no, un UPDATE seguido
+    de un INSERT para las claves que aún no existen.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table = TaskStats.__table__
+    dialect = connection.dialect.name
+
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        for key, delta in deltas.items():
+            stmt = dialect_insert(table).values(dict(zip(STATS_KEY, key), task_count=delta))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(STATS_KEY),
+                set_={'task_count': table.c.task_count + delta}
+            )
+            connection.execute(stmt)
+        return
+
+    for key, delta in deltas.items():
+        conditions = [table.c[name] == value for name, value in zip(STATS_KEY, key)]
+        result = connection.execute(
+            update(table).where(*conditions).values(task_count=table.c.task_count + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(dict(zip(STATS_KEY, key), task_count=delta)))
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_task_changes(session, flush_context, instances):
+    # Se calcula antes del flush para que las tareas eliminadas todavía se
+    # puedan leer de la base de datos si sus atributos habían expirado.
+    deltas = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            deltas[_current_key(obj)] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deltas[_original_key(obj)] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj, include_collections=False):
+            old_key, new_key = _original_key(obj), _current_key(obj)
+            if old_key != new_key:
+                deltas[old_key] -= 1
+                deltas[new_key] += 1
+
+    if deltas:
+        apply_stats_deltas(session.connection(), deltas)
+
+
+def rebuild_task_stats():
+    """Recalcula ``task_stats`` desde cero a partir de la tabla ``task``
+
+    Sirve para reparar desviaciones provocadas por operaciones que no pasan
+    por el ORM (``Query.delete()``, SQL manual...).
+    """
+    table = TaskStats.__table__
+    key_columns = [
+        Task.user_id,
+        func.coalesce(Task.status, ''),
+        func.coalesce(Task.category, ''),
+        func.coalesce(Task.priority, '')
+    ]
+    grouped = db.session.query(*key_columns, func.count(Task.id)).group_by(*key_columns)
+
+    db.session.execute(table.delete())
+    db.session.execute(
+        table.insert().from_select(list(STATS_KEY) + ['task_count'], grouped.statement)
+    )
+    db.session.commit()
+    return db.session.query(func.count()).select_from(TaskStats).scalar()
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Recalcula la tabla task_stats a partir de las tareas"""
+    rows = rebuild_task_stats()
+    print(f"task_stats reconstruida: {rows} filas")
@@ -0,0 +1,103 @@
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import db, Task, Tag, task_tag, parse_tags
+
+TAG_MODES = ('all', 'any')
+
+
+def ensure_tags(connection, names):
+    """Devuelve ``{nombre: id}`` creando las etiquetas que todavía no existen"""
+    names = set(names)
+    if not names:
+        return {}
+
+    table = Tag.__table__
+    existing = dict(connection.execute(
+        select(table.c.name, table.c.id).where(table.c.name.in_(names))
+    ).all())
+
+    missing = names - set(existing)
+    if missing:
+        dialect = connection.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=['name'])
+        else:
+            stmt = table.insert()
+        connection.execute(stmt, [{'name': name} for name in missing])
+        existing.update(connection.execute(
+            select(table.c.name, table.c.id).where(table.c.name.in_(missing))
+        ).all())
+
+    return existing
+
+
+def sync_task_tags(connection, tags_by_task, deleted_ids=()):
+    """Reemplaza las filas de ``task_tag`` de las tareas indicadas
+
+    ``tags_by_task`` es ``{task_id: [nombres]}``; las tareas de
+    ``deleted_ids`` solo pierden sus etiquetas. Todo se hace con sentencias
+    en bloque para que sirva también en operaciones masivas.
+    """
+    task_ids = list(tags_by_task) + list(deleted_ids)
+    if not task_ids:
+        return
+
+    connection.execute(task_tag.delete().where(task_tag.c.task_id.in_(task_ids)))
+
+    tag_ids = ensure_tags(connection, {name for names in tags_by_task.values() for name in names})
+    rows = [{'task_id': task_id, 'tag_id': tag_ids[name]}
+            for task_id, names in tags_by_task.items() for name in names]
+    if rows:
+        connection.execute(task_tag.insert(), rows)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_tag_changes(session, flush_context):
+    # Después del flush las tareas nuevas ya tienen id y el historial de
+    # atributos todavía indica qué tareas cambiaron sus etiquetas.
+    tags_by_task, deleted_ids = {}, []
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            tags_by_task[obj.id] = parse_tags(obj.tags)
+
+    for obj in session.dirty:
+        if isinstance(obj, Task) and inspect(obj).attrs.tags.history.has_changes():
+            tags_by_task[obj.id] = parse_tags(obj.tags)
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deleted_ids.append(inspect(obj).identity[0])
+
+    if tags_by_task or deleted_ids:
+        sync_task_tags(session.connection(), tags_by_task, deleted_ids)
+
+
+def filter_by_tags(query, names, mode='all'):
+    """Filtra tareas por etiquetas en SQL
+
+    ``all`` exige todas las etiquetas y ``any`` al menos una. Se resuelve con
+    el índice (tag_id, task_id) sin recorrer la tabla ``task``.
+    """
+    names = parse_tags(names)
+    if not names:
+        return query
+
+    matching = select(task_tag.c.task_id).join(Tag, Tag.id == task_tag.c.tag_id).where(Tag.name.in_(names))
+    if mode == 'all' and len(names) > 1:
+        matching = matching.group_by(task_tag.c.task_id).having(
+            func.count(task_tag.c.tag_id) == len(names)
+        )
+    return query.filter(Task.id.in_(matching))
+
+
+def tag_counts(user_id=None):
+    """Número de tareas por etiqueta, de más a menos usada"""
+    count = func.count(task_tag.c.task_id)
+    query = db.session.query(Tag.name, count).join(task_tag, task_tag.c.tag_id == Tag.id)
+    if user_id:
+        query = query.join(Task, Task.id == task_tag.c.task_id).filter(Task.user_id == user_id)
+    return query.group_by(Tag.id, Tag.name).order_by(count.desc(), Tag.name).all()
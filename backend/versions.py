@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, delete, event, func, inspect, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import db, Task, DataVersion, TaskTombstone
+
+GLOBAL_SCOPE = 0
+# Fila especial de data_version con la última versión cuyos tombstones ya se
+# eliminaron: los cursores anteriores no pueden sincronizarse de forma incremental
+TOMBSTONE_HORIZON_SCOPE = -1
+TOMBSTONE_RETENTION_DAYS = 30
+
+
+def _upsert(connection, table, index_elements, rows, set_):
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_(stmt.excluded))
+        connection.execute(stmt, rows)
+        return
+
+    for row in rows:
+        key = {name: row[name] for name in index_elements}
+        conditions = [table.c[name] == value for name, value in key.items()]
+        values = {name: value for name, value in row.items() if name not in key}
+        result = connection.execute(update(table).where(*conditions).values(**values))
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+def bump_versions(connection, user_ids):
+    """Incrementa la versión global y la de cada usuario indicado
+
+    Devuelve la nueva versión global, que se usa como ``change_seq`` de las
+    tareas modificadas. El incremento bloquea la fila global hasta el commit,
+    así que las versiones siguen el orden en que se confirman las transacciones.
+    """
+    scopes = sorted({GLOBAL_SCOPE} | {user_id for user_id in user_ids if user_id is not None})
+    table = DataVersion.__table__
+    _upsert(
+        connection, table, ['scope'],
+        [{'scope': scope, 'version': 1} for scope in scopes],
+        lambda excluded: {'version': table.c.version + 1}
+    )
+    return connection.execute(select(table.c.version).where(table.c.scope == GLOBAL_SCOPE)).scalar()
+
+
+def record_tombstones(connection, deleted, change_seq):
+    """Registra las tareas eliminadas ``[(task_id, user_id)]`` con su versión"""
+    if not deleted:
+        return
+    now = datetime.utcnow()
+    table = TaskTombstone.__table__
+    _upsert(
+        connection, table, ['task_id'],
+        [{'task_id': task_id, 'user_id': user_id, 'change_seq': change_seq, 'deleted_at': now}
+         for task_id, user_id in deleted],
+        lambda excluded: {
+            'user_id': excluded.user_id,
+            'change_seq': excluded.change_seq,
+            'deleted_at': excluded.deleted_at
+        }
+    )
+
+
+def clear_tombstones(connection, task_ids):
+    """Elimina los tombstones de los ids de tareas recién insertadas
+
+    SQLite reutiliza el rowid más alto cuando se borra la última tarea: sin
+    esto la tarea nueva aparecería a la vez en ``changes`` y en ``deleted``.
+    """
+    if task_ids:
+        connection.execute(delete(TaskTombstone).where(TaskTombstone.task_id.in_(task_ids)))
+
+
+def version_scope(user_id=None):
+    """Fila de ``data_version`` del usuario indicado o la global si no hay usuario"""
+    try:
+        return int(user_id) if user_id else GLOBAL_SCOPE
+    except ValueError:
+        return GLOBAL_SCOPE
+
+
+def version_statement(scope):
+    return select(DataVersion.version).where(DataVersion.scope == scope)
+
+
+def current_version(user_id=None):
+    """Versión actual del usuario indicado o la global si no hay usuario"""
+    scope = version_scope(user_id)
+    version = db.session.execute(version_statement(scope)).scalar()
+    return scope, version or 0
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_version_changes(session, flush_context, instances):
+    user_ids, changed, deleted = set(), [], []
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            user_ids.add(obj.user_id)
+            changed.append(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj, include_collections=False):
+            user_ids.update(inspect(obj).attrs.user_id.history.deleted)
+            user_ids.add(obj.user_id)
+            changed.append(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            original_user_ids = inspect(obj).attrs.user_id.history.deleted
+            user_id = original_user_ids[0] if original_user_ids else obj.user_id
+            user_ids.add(user_id)
+            deleted.append((obj.id, user_id))
+
+    if not user_ids:
+        return
+
+    connection = session.connection()
+    change_seq = bump_versions(connection, user_ids)
+    for obj in changed:
+        obj.change_seq = change_seq
+    record_tombstones(connection, deleted, change_seq)
+
+
+@event.listens_for(Session, 'after_flush')
+def _clear_reused_tombstones(session, flush_context):
+    # Los ids de las tareas nuevas solo se conocen después del flush
+    clear_tombstones(session.connection(), [obj.id for obj in session.new if isinstance(obj, Task)])
+
+
+def parse_sync_cursor(value):
+    """Convierte el cursor de ``/api/tasks/changes`` en ``(change_seq, último id)``
+
+    ``"N"`` indica todos los cambios posteriores a la versión N (último id
+    ``None``) y ``"N:id"`` continúa dentro de la versión N después de ese id.
+    Sin valor se pide una sincronización completa. Lanza ``ValueError`` si
+    el cursor no es válido.
+    """
+    if value in (None, ''):
+        return -1, None
+    seq, _, last_id = str(value).partition(':')
+    try:
+        return int(seq), int(last_id) if last_id else None
+    except ValueError:
+        raise ValueError('Invalid cursor')
+
+
+def encode_sync_cursor(seq, last_id=None):
+    return str(seq) if last_id is None else f'{seq}:{last_id}'
+
+
+def changes_since(query, cursor, user_id=None, limit=500):
+    """Filtra ``query`` a las tareas modificadas después del cursor ``(change_seq, id)``
+
+    Devuelve ``(tareas, ids_eliminados, nuevo_cursor, hay_más)``. Tareas y
+    tombstones se recorren juntos en orden ``(change_seq, id)``, así que una
+    página puede terminar dentro de una versión con muchas filas y la
+    siguiente continúa justo después. Lanza ``LookupError`` si el cursor es
+    anterior al horizonte de tombstones. Un ``change_seq`` negativo pide una
+    sincronización completa, sin eliminaciones.
+    """
+    since, after_id = cursor
+    full_sync = since < 0
+    _, horizon = current_version(TOMBSTONE_HORIZON_SCOPE)
+    if not full_sync and since < horizon:
+        raise LookupError('Cursor expired, a full resync is required')
+
+    # Leer la versión antes que los cambios: todo lo que tenga change_seq <= upto
+    # ya está confirmado, y lo que se confirme después quedará para la próxima
+    _, upto = current_version()
+
+    def scoped(query, seq, key, owner):
+        after = seq > since if after_id is None else or_(seq > since, and_(seq == since, key > after_id))
+        query = query.filter(after, seq <= upto)
+        if user_id:
+            query = query.filter(owner == user_id)
+        return query
+
+    # Claves de las primeras limit+1 filas de cada tabla: bastan para saber
+    # dónde termina la página en el recorrido conjunto
+    task_keys = scoped(db.session.query(Task.change_seq, Task.id), Task.change_seq, Task.id, Task.user_id) \
+        .order_by(Task.change_seq, Task.id).limit(limit + 1).all()
+    tombstone_keys = [] if full_sync else scoped(
+        db.session.query(TaskTombstone.change_seq, TaskTombstone.task_id),
+        TaskTombstone.change_seq, TaskTombstone.task_id, TaskTombstone.user_id
+    ).order_by(TaskTombstone.change_seq, TaskTombstone.task_id).limit(limit + 1).all()
+
+    keys = sorted([tuple(key) for key in task_keys] + [tuple(key) for key in tombstone_keys])
+    has_more = len(keys) > limit
+    if has_more:
+        # La página termina en la fila número limit, aunque sea a mitad de una versión
+        keys = keys[:limit]
+        last_seq, last_id = keys[-1]
+        query = query.filter(or_(Task.change_seq < last_seq,
+                                 and_(Task.change_seq == last_seq, Task.id <= last_id)))
+        next_cursor = encode_sync_cursor(last_seq, last_id)
+    else:
+        next_cursor = encode_sync_cursor(max(upto, since))
+
+    tasks = scoped(query, Task.change_seq, Task.id, Task.user_id).order_by(Task.change_seq, Task.id).all()
+    # Un id puede estar en ambos si se reutilizó antes de limpiar su tombstone:
+    # la tarea viva tiene prioridad
+    changed_ids = {task.id for task in tasks}
+    page = set(keys)
+    deleted_ids = [task_id for seq, task_id in tombstone_keys
+                   if (seq, task_id) in page and task_id not in changed_ids]
+
+    return tasks, deleted_ids, next_cursor, has_more
+
+
+def prune_tombstones(retention_days=TOMBSTONE_RETENTION_DAYS):
+    """Elimina los tombstones más antiguos que la retención y avanza el horizonte"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    expired = TaskTombstone.query.filter(TaskTombstone.deleted_at < cutoff)
+    horizon = expired.with_entities(func.max(TaskTombstone.change_seq)).scalar()
+    if horizon is None:
+        return 0
+
+    deleted = expired.delete(synchronize_session=False)
+    table = DataVersion.__table__
+    _upsert(
+        db.session.connection(), table, ['scope'],
+        [{'scope': TOMBSTONE_HORIZON_SCOPE, 'version': horizon}],
+        lambda excluded: {'version': case(
+            (table.c.version > excluded.version, table.c.version), else_=excluded.version
+        )}
+    )
+    db.session.commit()
+    return deleted
+
+
+@click.command('prune-tombstones')
+@click.option('--days', default=TOMBSTONE_RETENTION_DAYS, show_default=True,
+              help='Días que se conservan los tombstones')
+@with_appcontext
+def prune_tombstones_command(days):
+    """Elimina los tombstones de tareas borradas hace más de N días"""
+    deleted = prune_tombstones(days)
+    print(f"Tombstones eliminados: {deleted}")
@@ -0,0 +1,7 @@
+"""Punto de entrada WSGI para servidores como gunicorn
+
+    gunicorn --workers 4 wsgi:app
+"""
+from app import create_app
+
+app = create_app()
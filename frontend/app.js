@@ -5,7 +5,8 @@ const state = {
     currentUser: null,
     tasks: [],
     currentView: 'tasks',
-    editingTask: null
+    editingTask: null,
+    eventSource: null
 };
 
 // Elementos DOM
@@ -397,10 +398,27 @@ function renderTimeTrackingTable(stats) {
 }
 
 // Funciones de API
+
+// Recorre un listado paginado siguiendo next_cursor y devuelve todas sus tareas
+async function fetchAllPages(url) {
+    const tasks = [];
+    const pageUrl = new URL(url, window.location.origin);
+    let cursor = null;
+    do {
+        if (cursor) pageUrl.searchParams.set('cursor', cursor);
+        const response = await fetch(pageUrl);
+        const page = await response.json();
+        tasks.push(...page.tasks);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return tasks;
+}
+
 async function fetchTasks() {
     try {
-        const response = await fetch(`${API_URL}/tasks`);
-        state.tasks = await response.json();
+        const params = new URLSearchParams({ limit: 500 });
+        if (state.currentUser) params.set('user_id', state.currentUser.id);
+        state.tasks = await fetchAllPages(`${API_URL}/tasks?${params}`);
         renderTasks();
         
         // Actualizar calendario si está visible
@@ -586,6 +604,7 @@ async function register(username, email, password) {
 }
 
 function logout() {
+    unsubscribeFromChanges();
     state.currentUser = null;
     localStorage.removeItem('user');
     showAuth();
@@ -600,13 +619,41 @@ function showApp() {
     dom.authContainer.style.display = 'none';
     dom.appContainer.style.display = 'flex';
     dom.userUsername.textContent = state.currentUser.username;
+    subscribeToChanges();
+}
+
+// Cambios en tiempo real (otras pestañas y usuarios) por Server-Sent Events
+function subscribeToChanges() {
+    unsubscribeFromChanges();
+    const source = new EventSource(`/api/stream?user_id=${state.currentUser.id}`);
+
+    const applyChange = (event) => {
+        const change = JSON.parse(event.data);
+        state.tasks = state.tasks.filter(task => task.id !== change.id);
+        if (change.task) state.tasks.push(change.task);
+        renderTasks();
+    };
+    source.addEventListener('created', applyChange);
+    source.addEventListener('updated', applyChange);
+    source.addEventListener('deleted', applyChange);
+    // Se perdieron eventos (reconexión tardía o cliente lento): recargar todo
+    source.addEventListener('resync', () => loadTasks());
+
+    state.eventSource = source;
+}
+
+function unsubscribeFromChanges() {
+    if (state.eventSource) {
+        state.eventSource.close();
+        state.eventSource = null;
+    }
 }
 
 // Funciones de tareas
 async function loadTasks() {
     try {
-        const response = await fetch(`/api/tasks?user_id=${state.currentUser.id}`);
-        state.tasks = await response.json();
+        const params = new URLSearchParams({ user_id: state.currentUser.id, limit: 500 });
+        state.tasks = await fetchAllPages(`/api/tasks?${params}`);
         renderTasks();
     } catch (error) {
         console.error('Error loading tasks:', error);